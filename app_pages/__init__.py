@@ -0,0 +1,8 @@
+# Streamlit app pages, one module per page. app.py imports only the selected
+# page's module, so a page's heavy dependencies load the first time it is shown.
+PAGES = {
+    "Dashboard": "app_pages.dashboard",
+    "Trend & Forecast": "app_pages.trend_forecast",
+    "Compare Localities": "app_pages.compare",
+    "Download Data": "app_pages.download",
+}
@@ -0,0 +1,33 @@
+import plotly.express as px
+import streamlit as st
+
+from app_pages.data import get_dashboard_aggregates, load_data, locality_options
+
+
+def render():
+    df, _, _, df_version = load_data()
+    aggregates = get_dashboard_aggregates(df_version, df)
+    localities = locality_options(df)
+
+    st.title("Compare Localities")
+
+    selected_locs = st.multiselect(
+        "Select Localities to Compare",
+        localities,
+        default=localities[:2]
+    )
+
+    stats_table = aggregates.stats_table(sorted(selected_locs))
+
+    fig = px.bar(
+        stats_table,
+        x="locality",
+        y="avg_price_sqft",
+        labels={"avg_price_sqft": "avg_price_per_sqft"},
+        title="Average Price per Sqft Comparison"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Locality Statistics")
+
+    st.dataframe(stats_table, use_container_width=True)
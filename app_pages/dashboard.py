@@ -0,0 +1,62 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from app_pages.data import get_dashboard_aggregates, load_data, locality_options
+
+
+def render():
+    df, _, _, df_version = load_data()
+    aggregates = get_dashboard_aggregates(df_version, df)
+
+    st.title("Nagpur Real Estate Dashboard")
+
+    selected_locality = st.selectbox("Select Locality", locality_options(df))
+
+    loc_metrics = aggregates.metrics[selected_locality]
+
+    
+    col1, col2, col3 = st.columns(3)
+
+    col1.metric(
+        "Avg Price / Sqft",
+        round(loc_metrics["avg_price_sqft"], 2)
+    )
+
+    col2.metric("Total Listings", loc_metrics["listings"])
+
+    col3.metric(
+        "Median Price",
+        round(loc_metrics["median_price"], 2)
+    )
+
+    # PRICE DISTRIBUTION 
+    st.subheader("Price Distribution")
+    counts, edges = aggregates.histograms[selected_locality]
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+    fig.update_layout(
+        title=f"{selected_locality} Price Distribution",
+        xaxis_title="avg_price_per_sqft",
+        yaxis_title="count",
+        bargap=0
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # TOP 5 EXPENSIVE & AFFORDABLE 
+    st.subheader("Top 5 Expensive vs Affordable Localities")
+
+    top5 = aggregates.top(5)
+    bottom5 = aggregates.bottom(5)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig_top = px.bar(top5, x="locality", y="avg_price_per_sqft",
+                         title="Top 5 Expensive")
+        st.plotly_chart(fig_top, use_container_width=True)
+
+    with col2:
+        fig_bottom = px.bar(bottom5, x="locality", y="avg_price_per_sqft",
+                            title="Top 5 Affordable")
+        st.plotly_chart(fig_bottom, use_container_width=True)
@@ -0,0 +1,82 @@
+import os
+import threading
+
+import streamlit as st
+
+from storage import read_stage
+
+
+CLEANED_COLUMNS = ["locality", "avg_price_per_sqft", "median_price", "total_listings", "scrape_date"]
+FORECAST_COLUMNS = ["locality", "current_price", "forecast_price", "%_growth", "trend"]
+LOCALITY_STATS_COLUMNS = ["locality", "avg_price_sqft", "median_price", "total_listings"]
+
+# Set to 0 to skip loading Prophet in the background at startup
+PRELOAD_FORECASTING = os.environ.get("NAGPUR_RE_PRELOAD_FORECASTING", "1") != "0"
+
+
+@st.cache_data
+def load_data():
+    from dashboard_aggregates import data_version
+
+    # Latest scrape only, and only the columns the pages use
+    df = read_stage("cleaned", columns=CLEANED_COLUMNS, latest=True)
+    forecast_summary = read_stage("forecast_summary", columns=FORECAST_COLUMNS, latest=True)
+    locality_stats = read_stage("locality_stats", columns=LOCALITY_STATS_COLUMNS, latest=True)
+    return df, forecast_summary, locality_stats, data_version(df)
+
+
+def locality_options(df):
+    return df["locality"].dropna().unique()
+
+
+@st.cache_resource
+def get_dashboard_aggregates(version, _df):
+    # Rankings, metric cards and histograms, built (or loaded) once per data version
+    from dashboard_aggregates import DashboardAggregates
+    return DashboardAggregates.load_or_build(_df, version)
+
+
+@st.cache_resource
+def get_locality_index(version, _df):
+    # Rows sorted by locality with offsets, so a page's locality is a slice
+    from locality_index import LocalityIndex
+    return LocalityIndex(_df)
+
+
+@st.cache_resource
+def get_forecast_cache():
+    # One cache for every session on this server, backed by the shared disk cache
+    from forecast_cache import ForecastCache
+    return ForecastCache()
+
+
+@st.cache_resource
+def get_timeseries_store():
+    from timeseries_store import TimeSeriesStore
+    return TimeSeriesStore()
+
+
+def _load_forecasting_backend():
+    from prophet import Prophet
+    # Constructing a model loads the cmdstanpy backend, the slow part of the first fit
+    Prophet()
+
+
+@st.cache_resource
+def preload_forecasting_backend():
+    """Starts importing Prophet on a daemon thread, once per server process.
+
+    Pages that do not forecast never wait for it; the Trend page joins the
+    thread before its first fit.
+    """
+    thread = threading.Thread(target=_load_forecasting_backend, name="prophet-preload", daemon=True)
+    if PRELOAD_FORECASTING:
+        thread.start()
+    return thread
+
+
+def wait_for_forecasting_backend():
+    thread = preload_forecasting_backend()
+    if thread.is_alive():
+        with st.spinner("Loading the forecasting backend..."):
+            thread.join()
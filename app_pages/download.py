@@ -0,0 +1,25 @@
+import streamlit as st
+
+from app_pages.data import load_data
+
+
+def render():
+    df, forecast_summary_df, _, _ = load_data()
+
+    st.title("⬇ Download Data")
+
+    st.download_button(
+        "Download Cleaned Data",
+        df.to_csv(index=False),
+        "nagpur_real_estate_cleaned.csv",
+        "text/csv"
+    )
+
+    st.download_button(
+        "Download Forecast Summary",
+        forecast_summary_df.to_csv(index=False),
+        "forecast_summary.csv",
+        "text/csv"
+    )
+
+    st.success("Files ready for download")
@@ -0,0 +1,84 @@
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from app_pages.data import (get_forecast_cache, get_locality_index, get_timeseries_store, load_data,
+                            locality_options, wait_for_forecasting_backend)
+from batch_forecast import MAX_FORECAST_DAYS, fit_prophet, locality_seed, locality_series, slice_horizon
+from forecast_cache import forecast_key, series_fingerprint
+from uncertainty import UncertaintyConfig
+
+
+def render():
+    df, forecast_summary_df, _, df_version = load_data()
+    locality_index = get_locality_index(df_version, df)
+
+    st.title("Price Trend & Forecast")
+
+    selected_locality = st.selectbox("Select Locality", locality_options(df))
+    forecast_days = st.slider("Forecast Days", 30, MAX_FORECAST_DAYS, 90)
+
+    df_loc = locality_index.rows(selected_locality)
+
+    seed = locality_seed(selected_locality)
+    ts_data = locality_series(selected_locality, df_loc["avg_price_per_sqft"].mean(),
+                              get_timeseries_store(), seed=seed)
+    if ts_data is None:
+        st.warning(f"No price data to forecast for {selected_locality}.")
+        st.stop()
+
+    # HISTORICAL TREND 
+    st.subheader("Historical Trend")
+    fig_hist = px.line(ts_data, x="ds", y="y",
+                       title=f"{selected_locality} Historical Trend")
+    st.plotly_chart(fig_hist, use_container_width=True)
+
+    # PROPHET FORECAST: one cached fit per locality and series version, out to
+    # the longest horizon; the slider only slices it. The band is computed as
+    # the batch run computes it (NAGPUR_RE_UNCERTAINTY), so its entries are hits.
+    uncertainty = UncertaintyConfig()
+
+    def fit():
+        wait_for_forecasting_backend()
+        return fit_prophet(ts_data, MAX_FORECAST_DAYS, seed, uncertainty)
+
+    trajectory = get_forecast_cache().get_or_compute(
+        forecast_key(selected_locality, series_fingerprint(ts_data), uncertainty.variant), fit
+    )
+    forecast = slice_horizon(trajectory, ts_data["ds"].max(), forecast_days)
+
+    st.subheader("Forecast with Confidence Interval")
+
+    fig_forecast = go.Figure()
+
+    fig_forecast.add_trace(go.Scatter(
+        x=ts_data["ds"], y=ts_data["y"],
+        mode="lines", name="Historical"
+    ))
+
+    fig_forecast.add_trace(go.Scatter(
+        x=forecast["ds"], y=forecast["yhat"],
+        mode="lines", name="Forecast"
+    ))
+
+    fig_forecast.add_trace(go.Scatter(
+        x=forecast["ds"], y=forecast["yhat_upper"],
+        line=dict(width=0), showlegend=False
+    ))
+
+    fig_forecast.add_trace(go.Scatter(
+        x=forecast["ds"], y=forecast["yhat_lower"],
+        fill="tonexty", mode="lines",
+        line=dict(width=0),
+        name="Confidence Interval"
+    ))
+
+    st.plotly_chart(fig_forecast, use_container_width=True)
+
+    # FORECAST SUMMARY TABLE
+    st.subheader("Forecast Summary")
+
+    st.dataframe(
+        forecast_summary_df.rename(columns={"growth_pct": "% Growth"}),
+        use_container_width=True
+    )
@@ -0,0 +1,264 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from baseline_forecast import holt, ols_trend
+from batch_forecast import (MIN_HISTORY_POINTS, calculate_growth, fit_prophet, locality_seed, locality_series,
+                            trend_label)
+from forecast_cache import series_fingerprint
+from page_cache import PageCache
+from uncertainty import UncertaintyConfig
+
+
+# Rolling-origin evaluation of the forecasters on each locality's series:
+#
+#   cutoff 3 |==========train==========|--horizon--|
+#   cutoff 2 |=======train========|--horizon--|
+#   cutoff 1 |====train=====|--horizon--|
+#
+# Every engine forecasts the held-out dates after each cutoff; results are
+# MAPE, interval coverage, fit time and how often the forecast's trend label
+# (batch_forecast.trend_label) matches the one the actual prices earn.
+#
+#   python backtest.py                              # every engine, every locality
+#   python backtest.py --engines ols holt --horizon 30 --folds 4
+#   python backtest.py --max-mape 5 --min-coverage 0.7   # also pick an engine per locality
+
+BACKTEST_CACHE_DIR = os.environ.get("NAGPUR_RE_BACKTEST_CACHE", "./cache/backtests")
+
+# "prophet" / "prophet_bootstrap": Prophet with its own or a bootstrapped band;
+# the rest are the vectorized baselines from baseline_forecast
+ENGINES = ("prophet", "prophet_bootstrap", "ols", "holt", "damped")
+
+RESULT_COLUMNS = ["locality", "engine", "source", "folds", "points", "mape", "coverage",
+                  "fit_seconds", "label_accuracy"]
+
+
+class BacktestSpec:
+    """Fold layout in days: ``horizon`` held out after each cutoff, cutoffs ``period`` apart.
+
+    At most ``folds`` cutoffs, latest first, each leaving at least
+    ``initial`` training points.
+    """
+
+    def __init__(self, horizon=30, period=15, folds=3, initial=30):
+        self.horizon = horizon
+        self.period = period
+        self.folds = folds
+        self.initial = max(initial, MIN_HISTORY_POINTS)
+
+    def key(self):
+        return f"h{self.horizon}-p{self.period}-f{self.folds}-i{self.initial}"
+
+    def cutoffs(self, ds):
+        """Cutoff dates for a sorted ``ds`` column, oldest first."""
+        ds = pd.to_datetime(ds)
+        cutoffs = []
+        cutoff = ds.iloc[-1] - pd.Timedelta(days=self.horizon)
+        while len(cutoffs) < self.folds and (ds <= cutoff).sum() >= self.initial:
+            cutoffs.append(cutoff)
+            cutoff -= pd.Timedelta(days=self.period)
+        return cutoffs[::-1]
+
+
+def _daily(train):
+    """A training series on a daily grid, carrying observations into days without a scrape."""
+    observed = train.set_index("ds")["y"]
+    grid = pd.date_range(observed.index.min(), observed.index.max())
+    return observed.reindex(observed.index.union(grid)).ffill().reindex(grid).to_numpy()[None, :]
+
+
+def forecast_engine(engine, train, dates, seed=0):
+    """``(point, lower, upper)`` arrays at ``dates`` from an engine fitted on ``train``."""
+    end = pd.Timestamp(train["ds"].max())
+    steps = ((pd.to_datetime(dates) - end) / pd.Timedelta(days=1)).to_numpy().astype(int)
+
+    if engine in ("prophet", "prophet_bootstrap"):
+        uncertainty = UncertaintyConfig("prophet" if engine == "prophet" else "bootstrap")
+        forecast = fit_prophet(train, int(steps.max()), seed, uncertainty).set_index("ds")
+        rows = forecast.reindex(pd.to_datetime(dates))
+        return rows["yhat"].to_numpy(), rows["yhat_lower"].to_numpy(), rows["yhat_upper"].to_numpy()
+
+    Y = _daily(train)
+    if engine == "ols":
+        # ols_trend broadcasts over an array of horizons
+        point, lower, upper = ols_trend(Y, steps)
+        return point, lower, upper
+    if engine not in ("holt", "damped"):
+        raise ValueError(f"Unknown engine {engine!r}; choose from {ENGINES}")
+    results = [holt(Y, step, phi=1.0 if engine == "holt" else 0.98) for step in steps]
+    return tuple(np.array([r[i][0] for r in results]) for i in range(3))
+
+
+def backtest_locality(locality, ts_data, engines, spec, seed=0):
+    """Scores every engine on one locality's series. Runs in a worker process.
+
+    Folds with no actual prices in their horizon (a gap in the scraped
+    history) are skipped; ``folds`` counts the folds that were scored.
+    Returns one dict per engine with RESULT_COLUMNS (``source`` left unset).
+    """
+    ts_data = ts_data.sort_values("ds").reset_index(drop=True)
+    cutoffs = spec.cutoffs(ts_data["ds"])
+    folds = []
+    for cutoff in cutoffs:
+        test = ts_data[(ts_data["ds"] > cutoff) & (ts_data["ds"] <= cutoff + pd.Timedelta(days=spec.horizon))]
+        if len(test):
+            folds.append((ts_data[ts_data["ds"] <= cutoff], test))
+
+    rows = []
+    for engine in engines:
+        errors, covered, seconds, labels = [], [], [], []
+        for train, test in folds:
+            start = time.perf_counter()
+            point, lower, upper = forecast_engine(engine, train, test["ds"], seed)
+            seconds.append(time.perf_counter() - start)
+
+            actual = test["y"].to_numpy()
+            errors.extend(np.abs(point - actual) / np.abs(actual))
+            covered.extend((actual >= lower) & (actual <= upper))
+            current = train["y"].iloc[-1]
+            labels.append(trend_label(calculate_growth(current, point[-1]))
+                          == trend_label(calculate_growth(current, actual[-1])))
+        rows.append({
+            "locality": locality,
+            "engine": engine,
+            "folds": len(folds),
+            "points": len(errors),
+            "mape": round(float(np.mean(errors)) * 100, 3) if errors else np.nan,
+            "coverage": round(float(np.mean(covered)), 3) if covered else np.nan,
+            "fit_seconds": round(float(np.mean(seconds)), 4) if seconds else np.nan,
+            "label_accuracy": round(float(np.mean(labels)), 3) if labels else np.nan,
+        })
+    return rows
+
+
+def backtest_key(locality, ts_data, engine, spec):
+    return f"{locality}|{series_fingerprint(ts_data)}|{engine}|{spec.key()}"
+
+
+def run_backtests(prices, engines=ENGINES, spec=None, workers=None, base_seed=0, store=None,
+                  cache_dir=BACKTEST_CACHE_DIR):
+    """Backtests every locality on a process pool and returns a RESULT_COLUMNS frame.
+
+    ``prices`` maps locality to its current mean price and picks the series
+    the forecasters use (locality_series: scraped history where there is
+    enough, simulated otherwise; ``source`` says which). Scores are cached by
+    the series' fingerprint, engine and fold layout, so a rerun only
+    evaluates localities whose data changed.
+    """
+    spec = spec or BacktestSpec()
+    cache = PageCache(cache_dir, ttl_seconds=float("inf"), suffix=".json.gz") if cache_dir else None
+
+    rows, pending = [], {}
+    for loc, price in prices.items():
+        seed = locality_seed(loc, base_seed)
+        ts_data = locality_series(loc, price, store, seed)
+        if ts_data is None:
+            continue
+        source = "simulated" if store is None or len(store.series(loc)) < MIN_HISTORY_POINTS else "history"
+        missing = []
+        for engine in engines:
+            body = cache.get(backtest_key(loc, ts_data, engine, spec)) if cache else None
+            if body is None:
+                missing.append(engine)
+            else:
+                rows.append(dict(json.loads(body), source=source))
+        if missing:
+            pending[loc] = (ts_data, missing, seed, source)
+    if rows:
+        print(f"Reused {len(rows)} cached backtest scores.")
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(backtest_locality, loc, ts_data, missing, spec, seed): loc
+            for loc, (ts_data, missing, seed, _) in pending.items()
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            loc = futures[future]
+            ts_data, _, _, source = pending[loc]
+            try:
+                scores = future.result()
+            except Exception as e:
+                print(f"Backtest failed for {loc}: {e}")
+                continue
+            for score in scores:
+                if cache:
+                    cache.put(backtest_key(loc, ts_data, score["engine"], spec), json.dumps(score).encode("utf-8"))
+                rows.append(dict(score, source=source))
+            if done % 25 == 0 or done == len(futures):
+                print(f"Backtested {done}/{len(futures)} localities.")
+
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    return results.sort_values(["locality", "engine"]).reset_index(drop=True)
+
+
+def engine_summary(results):
+    """Per-engine mean MAPE, coverage, fit time and trend-label accuracy over localities."""
+    return (
+        results.groupby("engine")
+        .agg(localities=("locality", "count"), mape=("mape", "mean"), coverage=("coverage", "mean"),
+             fit_seconds=("fit_seconds", "mean"), label_accuracy=("label_accuracy", "mean"))
+        .round(3)
+        .sort_values("mape")
+        .reset_index()
+    )
+
+
+def cheapest_adequate(results, max_mape=5.0, min_coverage=0.7):
+    """Per locality, the fastest engine within ``max_mape``% MAPE and ``min_coverage``.
+
+    A locality no engine is good enough for gets its lowest-MAPE engine,
+    with ``adequate`` False.
+    """
+    scored = results.dropna(subset=["mape"])
+    adequate = (scored["mape"] <= max_mape) & (scored["coverage"] >= min_coverage)
+    fastest = scored[adequate].sort_values("fit_seconds").drop_duplicates("locality").assign(adequate=True)
+    fallback = (scored[~scored["locality"].isin(fastest["locality"])]
+                .sort_values("mape").drop_duplicates("locality").assign(adequate=False))
+    picks = pd.concat([fastest, fallback], ignore_index=True)
+    return picks[["locality", "engine", "mape", "coverage", "fit_seconds", "adequate"]].sort_values("locality")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the forecasting engines per locality.")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=ENGINES)
+    parser.add_argument("--horizon", type=int, default=30, help="days held out after each cutoff")
+    parser.add_argument("--period", type=int, default=15, help="days between cutoffs")
+    parser.add_argument("--folds", type=int, default=3)
+    parser.add_argument("--initial", type=int, default=30, help="fewest training points in a fold")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--localities", nargs="+", default=None, help="only these localities")
+    parser.add_argument("--out", default="backtest_results.csv")
+    parser.add_argument("--max-mape", type=float, default=None, help="with --min-coverage, pick an engine per locality")
+    parser.add_argument("--min-coverage", type=float, default=0.7)
+    args = parser.parse_args()
+
+    from storage import read_stage
+    from timeseries_store import TimeSeriesStore
+
+    df = read_stage("cleaned", latest=True)
+    if args.localities:
+        df = df[df["locality"].isin(args.localities)]
+    prices = df.groupby("locality")["avg_price_per_sqft"].mean()
+    spec = BacktestSpec(args.horizon, args.period, args.folds, args.initial)
+
+    results = run_backtests(prices, args.engines, spec, args.workers, store=TimeSeriesStore())
+    results.to_csv(args.out, index=False)
+    print(engine_summary(results).to_string(index=False))
+    print(f"Saved {args.out}")
+
+    if args.max_mape is not None:
+        picks = cheapest_adequate(results, args.max_mape, args.min_coverage)
+        picks_path = os.path.splitext(args.out)[0] + "_engines.csv"
+        picks.to_csv(picks_path, index=False)
+        print(picks["engine"].value_counts().to_string())
+        print(f"Saved {picks_path}")
+
+
+if __name__ == "__main__":
+    main()
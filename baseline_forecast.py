@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+from batch_forecast import locality_seed, locality_series
+
+
+METHODS = ("ols", "holt", "damped")
+
+# Two-sided 80% normal quantile, Prophet's default interval width
+Z_80 = 1.2816
+
+
+def build_series_matrix(prices, days=120, base_seed=0, store=None):
+    """Stacks every locality's series into a (locality x time) matrix.
+
+    ``prices`` maps locality to its current mean price; localities without a
+    usable price are dropped. Uses the same series as the Prophet path; real
+    histories are put on a daily grid of the last ``days`` days, carrying the
+    nearest observation into days without a scrape.
+    """
+    localities, rows = [], []
+    for loc, price in prices.items():
+        ts_data = locality_series(loc, price, store, seed=locality_seed(loc, base_seed))
+        if ts_data is None:
+            continue
+        y = ts_data["y"]
+        if len(ts_data) != days:
+            grid = pd.date_range(end=ts_data["ds"].max(), periods=days)
+            observed = ts_data.set_index("ds")["y"]
+            y = observed.reindex(observed.index.union(grid)).ffill().bfill().reindex(grid)
+        localities.append(loc)
+        rows.append(y.to_numpy())
+    return localities, np.vstack(rows) if rows else np.empty((0, days))
+
+
+def ols_trend(Y, horizon):
+    """Least-squares line per row. Returns (point, lower, upper) at ``horizon`` steps ahead."""
+    n = Y.shape[1]
+    t = np.arange(n, dtype=float)
+    t_mean = t.mean()
+    s_tt = ((t - t_mean) ** 2).sum()
+
+    y_mean = Y.mean(axis=1)
+    slope = (Y - y_mean[:, None]) @ (t - t_mean) / s_tt
+    intercept = y_mean - slope * t_mean
+
+    residuals = Y - (intercept[:, None] + slope[:, None] * t)
+    sigma = np.sqrt((residuals ** 2).sum(axis=1) / max(n - 2, 1))
+
+    t_future = n - 1 + horizon
+    point = intercept + slope * t_future
+    half_width = Z_80 * sigma * np.sqrt(1 + 1 / n + (t_future - t_mean) ** 2 / s_tt)
+    return point, point - half_width, point + half_width
+
+
+def holt(Y, horizon, alpha=0.3, beta=0.1, phi=1.0):
+    """Holt's linear trend (``phi=1``) or damped trend (``phi<1``), all rows at once.
+
+    The recursion runs over time only; each step updates every locality with
+    array arithmetic. Returns (point, lower, upper) at ``horizon`` steps ahead.
+    """
+    level = Y[:, 0].copy()
+    trend = Y[:, 1] - Y[:, 0]
+    errors = np.empty((Y.shape[0], Y.shape[1] - 1))
+    for i in range(1, Y.shape[1]):
+        expected = level + phi * trend
+        errors[:, i - 1] = Y[:, i] - expected
+        new_level = alpha * Y[:, i] + (1 - alpha) * expected
+        trend = beta * (new_level - level) + (1 - beta) * phi * trend
+        level = new_level
+
+    steps = np.arange(1, horizon + 1)
+    damping = (phi ** steps).sum()
+    point = level + damping * trend
+    sigma = errors.std(axis=1)
+
+    # Holt's h-step forecast variance, undamped approximation
+    c = (alpha ** 2 * (1 + (steps[:-1] * beta)) ** 2).sum() if horizon > 1 else 0.0
+    half_width = Z_80 * sigma * np.sqrt(1 + c)
+    return point, point - half_width, point + half_width
+
+
+def baseline_forecasts(df, method="ols", periods=90, base_seed=0, price_column="avg_price_per_sqft", store=None):
+    """Forecast summary rows for every locality from one vectorized fit.
+
+    Same schema as batch_forecast.run_batch_forecasts, plus the interval
+    (``forecast_lower``/``forecast_upper``) used to decide which localities
+    deserve a Prophet fit.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown baseline method {method!r}; choose from {METHODS}")
+    prices = df.groupby("locality")[price_column].mean()
+    localities, Y = build_series_matrix(prices, base_seed=base_seed, store=store)
+    if not localities:
+        return pd.DataFrame(columns=["locality", "current_price", "forecast_price", "%_growth", "trend"])
+
+    if method == "ols":
+        point, lower, upper = ols_trend(Y, periods)
+    else:
+        point, lower, upper = holt(Y, periods, phi=1.0 if method == "holt" else 0.98)
+
+    current = Y[:, -1]
+    # calculate_growth, vectorized
+    growth = np.where(current > 0, (point - current) / np.where(current > 0, current, 1) * 100, 0)
+    return pd.DataFrame({
+        "locality": localities,
+        "current_price": np.round(current, 2),
+        "forecast_price": np.round(point, 2),
+        "%_growth": np.round(growth, 2),
+        "trend": np.where(growth > 0, "Upward", "Downward"),
+        "forecast_lower": np.round(lower, 2),
+        "forecast_upper": np.round(upper, 2),
+    })
+
+
+def flag_for_prophet(summary, growth_threshold=2.0, max_relative_width=0.15):
+    """Localities whose baseline growth is outside +/-threshold% or whose interval is wide.
+
+    Flat, well-determined localities keep their baseline row; the rest are
+    worth a full Prophet fit.
+    """
+    relative_width = (summary["forecast_upper"] - summary["forecast_lower"]) / summary["forecast_price"].abs()
+    flagged = (summary["%_growth"].abs() > growth_threshold) | (relative_width > max_relative_width)
+    return summary.loc[flagged, "locality"].tolist()
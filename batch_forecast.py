@@ -0,0 +1,244 @@
+import logging
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from forecast_cache import forecast_key, series_fingerprint
+from model_store import ModelStore, warm_start_params
+from uncertainty import UncertaintyConfig, bootstrap_intervals
+
+
+FORECAST_COLUMNS = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+
+# Longest horizon the app offers; every fit predicts this far and shorter
+# horizons are slices of the same trajectory.
+MAX_FORECAST_DAYS = 180
+
+# Fewest observed scrape dates before a locality's real history replaces the
+# simulated series
+MIN_HISTORY_POINTS = 5
+
+
+def locality_seed(locality, base_seed=0):
+    """Stable per-locality seed, independent of process and iteration order."""
+    return (zlib.crc32(str(locality).encode("utf-8")) + base_seed) % 2 ** 32
+
+
+def create_simulated_timeseries(current_price, days=120, seed=None, end=None):
+    if pd.isna(current_price) or current_price <= 0:
+        return None
+
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end=end or pd.Timestamp.today().normalize(), periods=days)
+
+    trend = np.linspace(0, current_price * 0.05, days)
+    noise = rng.normal(0, current_price * 0.02, days)
+
+    prices = current_price + trend + noise
+
+    return pd.DataFrame({"ds": dates, "y": prices})
+
+
+def locality_series(locality, current_price, store=None, seed=None, min_points=MIN_HISTORY_POINTS):
+    """The ``ds``/``y`` frame to forecast a locality from.
+
+    The locality's scraped history from a TimeSeriesStore when it has at
+    least ``min_points`` dates, otherwise the seeded simulated series around
+    ``current_price``.
+    """
+    if store is not None:
+        ts_data = store.series(locality)
+        if len(ts_data) >= min_points:
+            return ts_data
+    return create_simulated_timeseries(current_price, seed=seed)
+
+
+def calculate_growth(current_price, forecast_price):
+    if pd.isna(current_price) or current_price <= 0:
+        return 0
+    return ((forecast_price - current_price) / current_price) * 100
+
+
+def trend_label(growth):
+    """The explore notebook's label for a forecast % growth."""
+    if growth > 7:
+        return "↑ Rising"
+    if growth > 2:
+        return "↑ Stable"
+    if growth < -2:
+        return "↓ Falling"
+    return "→ Flat"
+
+
+def _fit_model(ts_data, init=None, uncertainty=None):
+    from prophet import Prophet
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+
+    uncertainty = uncertainty or UncertaintyConfig()
+    model = Prophet(uncertainty_samples=uncertainty.prophet_samples, interval_width=uncertainty.interval_width)
+    if init is None:
+        return model.fit(ts_data)
+    return model.fit(ts_data, init=init)
+
+
+def _predict(model, periods, seed=0, uncertainty=None):
+    """The ``ds``/``yhat`` trajectory, with Prophet's band unless the bootstrap will add it."""
+    uncertainty = uncertainty or UncertaintyConfig()
+    # A model from the ModelStore keeps the settings it was fitted with
+    model.uncertainty_samples = uncertainty.prophet_samples
+    model.interval_width = uncertainty.interval_width
+    # Prophet draws its uncertainty samples from the global NumPy state
+    np.random.seed(seed)
+    future = model.make_future_dataframe(periods=periods)
+    forecast = model.predict(future)
+    return forecast[[column for column in FORECAST_COLUMNS if column in forecast]]
+
+
+def fit_prophet(ts_data, periods=90, seed=0, uncertainty=None):
+    """Fits Prophet on a ``ds``/``y`` frame and returns the ``ds``/``yhat``/band forecast."""
+    uncertainty = uncertainty or UncertaintyConfig()
+    forecast = _predict(_fit_model(ts_data, uncertainty=uncertainty), periods, seed, uncertainty)
+    if uncertainty.engine == "bootstrap":
+        forecast, = bootstrap_intervals([ts_data], [forecast], uncertainty.samples, uncertainty.quantiles, [seed])
+    return forecast
+
+
+def slice_horizon(forecast, history_end, days):
+    """History plus the first ``days`` days of a longer forecast trajectory.
+
+    Prophet's point forecast for a date does not depend on how far past it the
+    model is asked to predict, so this equals fitting with ``periods=days``.
+    """
+    return forecast[forecast["ds"] <= pd.Timestamp(history_end) + pd.Timedelta(days=days)]
+
+
+def summarize_forecast(locality, ts_data, trajectory, periods=90):
+    forecast = slice_horizon(trajectory, ts_data["ds"].max(), periods)
+
+    current_price = ts_data["y"].iloc[-1]
+    forecast_price = forecast["yhat"].iloc[-1]
+
+    growth = calculate_growth(current_price, forecast_price)
+
+    return {
+        "locality": locality,
+        "current_price": round(current_price, 2),
+        "forecast_price": round(forecast_price, 2),
+        "%_growth": round(growth, 2),
+        "trend": "Upward" if growth > 0 else "Downward"
+    }
+
+
+def fit_locality(locality, ts_data, periods=90, seed=0, model_dir=None, uncertainty=None):
+    """Fits one locality's Prophet model.
+
+    Returns ``(summary_row, trajectory, data_version, fit_info)``, where
+    fit_info has the fit's ``seconds`` and ``mode`` (cold, warm or reused).
+    With ``model_dir`` the fitted model is kept in a ModelStore: a locality
+    whose series is unchanged reuses its stored model without fitting, and a
+    changed one starts the optimizer from the stored parameters. With the
+    bootstrap uncertainty engine the trajectory has no band yet. Runs in a
+    worker process.
+    """
+    start = time.perf_counter()
+    data_version = series_fingerprint(ts_data)
+    store = ModelStore(model_dir) if model_dir else None
+    stored_version, model = store.load(locality) if store else (None, None)
+
+    mode = "reused"
+    if model is None or stored_version != data_version:
+        init = warm_start_params(model) if model is not None else None
+        mode = "cold" if init is None else "warm"
+        try:
+            model = _fit_model(ts_data, init, uncertainty)
+        except Exception:
+            if init is None:
+                raise
+            # Stale parameters (e.g. a different number of changepoints): fit cold
+            mode = "cold"
+            model = _fit_model(ts_data, uncertainty=uncertainty)
+        if store:
+            store.save(locality, data_version, model)
+
+    trajectory = _predict(model, max(periods, MAX_FORECAST_DAYS), seed, uncertainty)
+    fit_info = {"seconds": time.perf_counter() - start, "mode": mode}
+    return summarize_forecast(locality, ts_data, trajectory, periods), trajectory, data_version, fit_info
+
+
+def run_batch_forecasts(df, workers=None, periods=90, base_seed=0, price_column="avg_price_per_sqft", cache=None,
+                        model_dir=None, store=None, metrics=None, uncertainty=None):
+    """Fits every locality's forecast on a process pool.
+
+    Rows are collected as fits complete; a locality whose fit raises is
+    reported and skipped instead of aborting the batch. With a ForecastCache
+    each forecast trajectory is stored for the app to serve, and a locality
+    whose series already has a cached trajectory is summarized from it
+    without a worker. ``model_dir`` enables warm-started refits (see
+    fit_locality); with a TimeSeriesStore localities are fit on their scraped
+    history where there is enough of it. Each fit's time is recorded in
+    ``metrics`` (a PipelineMetrics) when given. ``uncertainty`` (an
+    UncertaintyConfig, from the environment by default) picks how the bands
+    are computed; with the bootstrap engine they are added for every fitted
+    locality in one vectorized pass before caching. Returns
+    ``(forecast_summaries, failures)`` where failures maps locality to the
+    error message.
+    """
+    workers = workers or os.cpu_count()
+    uncertainty = uncertainty or UncertaintyConfig()
+    prices = df.groupby("locality")[price_column].mean()
+
+    forecast_summaries = []
+    failures = {}
+    pending = {}
+    for loc, price in prices.items():
+        seed = locality_seed(loc, base_seed)
+        ts_data = locality_series(loc, price, store, seed)
+        if ts_data is None or len(ts_data) < 5:
+            continue
+        key = forecast_key(loc, series_fingerprint(ts_data), uncertainty.variant)
+        trajectory = cache.get(key) if cache is not None else None
+        if trajectory is not None:
+            forecast_summaries.append(summarize_forecast(loc, ts_data, trajectory, periods))
+        else:
+            pending[loc] = (ts_data, seed)
+    if forecast_summaries:
+        print(f"Reused cached forecasts for {len(forecast_summaries)} unchanged localities.")
+
+    fitted = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(fit_locality, loc, ts_data, periods, seed, model_dir, uncertainty): loc
+            for loc, (ts_data, seed) in pending.items()
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            loc = futures[future]
+            try:
+                summary, trajectory, data_version, fit_info = future.result()
+            except Exception as e:
+                failures[loc] = str(e)
+                print(f"Forecast failed for {loc}: {e}")
+                if metrics is not None:
+                    metrics.record_fit(loc, 0.0, "failed")
+                continue
+            forecast_summaries.append(summary)
+            if metrics is not None:
+                metrics.record_fit(loc, fit_info["seconds"], fit_info["mode"])
+            fitted[loc] = (trajectory, data_version)
+            if done % 25 == 0 or done == len(futures):
+                print(f"Fitted {done}/{len(futures)} localities.")
+
+    if fitted and uncertainty.engine == "bootstrap":
+        trajectories = bootstrap_intervals([pending[loc][0] for loc in fitted],
+                                           [trajectory for trajectory, _ in fitted.values()],
+                                           uncertainty.samples, uncertainty.quantiles,
+                                           [pending[loc][1] for loc in fitted])
+        fitted = {loc: (trajectory, fitted[loc][1]) for loc, trajectory in zip(fitted, trajectories)}
+    if cache is not None:
+        for loc, (trajectory, data_version) in fitted.items():
+            cache.put(forecast_key(loc, data_version, uncertainty.variant), trajectory)
+
+    return forecast_summaries, failures
@@ -0,0 +1,271 @@
+import argparse
+import gzip
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from baseline_forecast import baseline_forecasts
+from card_parser import BACKENDS
+from cleaning import (clean_area, clean_area_series, clean_listings, clean_locality, clean_locality_series,
+                      clean_price, clean_price_series, summarize_localities)
+from dashboard_aggregates import DashboardAggregates
+from locality_index import LocalityIndex
+from storage import read_stage, write_stage
+from stream_cleaning import clean_raw_csv
+
+
+# Offline benchmarks for the pipeline's hot paths on synthetic data.
+#
+#   python benchmark.py                                # 10k/100k/1M listings -> bench_results.json
+#   python benchmark.py --save-baseline                # also store the run as the baseline
+#   python benchmark.py --sizes 10000 --skip-prophet   # quick run
+#
+# Every run is compared with the baseline file when it exists; a benchmark
+# that got slower than --tolerance (and by more than --min-delta seconds) is
+# reported and the script exits with status 1. Baselines are only comparable
+# on the same machine.
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+LOCALITY_WORDS = ["MIHAN", "WARDHA", "MANISH", "BESA", "HINGNA", "DIGHORI", "PARDI", "KORADI",
+                  "JAMTHA", "BELTARODI", "HUDKESHWAR", "NARENDRA", "TRIMURTI", "PRATAP", "SOMALWADA"]
+SUFFIXES = ["NAGAR", "ROAD", "LAYOUT", "PHASE 2", "COLONY", ""]
+PROPERTY_TYPES = ["Flat", "Plot", "House", "Villa"]
+
+# Row-level reference cleaners are only timed up to this many rows
+REFERENCE_MAX_ROWS = 100_000
+
+
+def locality_names(count, seed=0):
+    rng = np.random.default_rng(seed)
+    words = rng.choice(LOCALITY_WORDS, size=(count, 2))
+    suffixes = rng.choice(SUFFIXES, size=count)
+    return [f"{a} {b} {s} {i}".replace("  ", " ").strip() for i, ((a, b), s) in enumerate(zip(words, suffixes))]
+
+
+def synthetic_raw(rows, localities=500, seed=0):
+    """Raw listings shaped like the scraper's output, with the text formats the cleaners handle.
+
+    Prices mix "₹85.5 Lac", "1.2 Cr" and plain rupees; areas carry units and
+    commas; localities carry the city and noise words; about 5% of rows repeat
+    an earlier listing and 1% miss a price.
+    """
+    rng = np.random.default_rng(seed)
+    names = np.array(locality_names(localities, seed))
+    locality = names[rng.integers(0, localities, rows)]
+    area = rng.integers(400, 4000, rows)
+    pps = rng.normal(5000, 1500, rows).clip(800, 20000).round()
+    price = area * pps
+
+    style = rng.integers(0, 3, rows)
+    price_text = np.where(style == 0, [f"₹{p / 1e5:.1f} Lac" for p in price],
+                          np.where(style == 1, [f"₹{p / 1e7:.2f} Cr" for p in price], price.astype(int).astype(str)))
+    df = pd.DataFrame({
+        "locality": pd.Series(locality, dtype=object) + ", Nagpur",
+        "property_type": rng.choice(PROPERTY_TYPES, rows),
+        "total_price": price_text,
+        "area_sqft": [f"{a:,} sqft" for a in area],
+        "price_per_sqft": pps,
+        "scrape_date": "2026-01-01",
+        "url": [f"https://www.magicbricks.com/prop-pdpid-{i}" for i in range(rows)],
+    })
+    repeats = rng.random(rows) < 0.05
+    df.loc[repeats, ["total_price", "locality", "area_sqft", "url"]] = \
+        df.loc[rng.integers(0, rows, repeats.sum()), ["total_price", "locality", "area_sqft", "url"]].to_numpy()
+    df.loc[rng.random(rows) < 0.01, "total_price"] = None
+    return df
+
+
+def synthetic_page(page, cards=30, seed=0):
+    rng = np.random.default_rng(seed + page)
+    names = locality_names(60, seed)
+    html = []
+    for i in range(cards):
+        loc = names[rng.integers(0, len(names))].title()
+        area = int(rng.integers(400, 4000))
+        pps = int(rng.integers(2000, 12000))
+        html.append(
+            f'<div class="mb-srp__card"><a class="mb-srp__card__link" href="/prop-{page}-{i}-pdpid-{page * 100 + i}">x</a>'
+            f'<h2 class="mb-srp__card--title">{rng.integers(1, 5)} BHK {rng.choice(PROPERTY_TYPES)} for Sale in {loc}, Nagpur</h2>'
+            f'<span class="mb-srp__card--location">{loc}, Nagpur</span>'
+            f'<div class="mb-srp__card__price--amount">₹{area * pps / 1e5:.1f} Lac</div>'
+            f'<div class="mb-srp__card__summary--value">{area:,} sqft</div>'
+            f'<div class="mb-srp__card__price--size">₹{pps:,} per sqft</div></div>'
+        )
+    return f"<html><body><div class='mb-srp__list'>{''.join(html)}</div></body></html>".encode("utf-8")
+
+
+def load_fixtures(fixtures_dir, pages=20):
+    """Saved result pages (``*.html.gz``, e.g. a scrape's PageCache dir), created synthetically if the dir is empty."""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    names = sorted(name for name in os.listdir(fixtures_dir) if name.endswith(".html.gz"))
+    if not names:
+        for page in range(1, pages + 1):
+            with gzip.open(os.path.join(fixtures_dir, f"page_{page:03d}.html.gz"), "wb") as f:
+                f.write(synthetic_page(page))
+        names = sorted(name for name in os.listdir(fixtures_dir) if name.endswith(".html.gz"))
+    pages_html = []
+    for name in names:
+        with gzip.open(os.path.join(fixtures_dir, name), "rb") as f:
+            pages_html.append(f.read())
+    return pages_html
+
+
+def timed(fn, repeat=3):
+    """Best wall time of ``repeat`` calls, and the last call's result."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_parsing(pages, repeat):
+    results = {}
+    for backend, parse in BACKENDS.items():
+        try:
+            results[f"parse.{backend}"], _ = timed(lambda: [parse(html, "2026-01-01") for html in pages], repeat)
+        except ImportError:
+            continue
+    return results
+
+
+def bench_size(rows, repeat, workdir):
+    raw = synthetic_raw(rows)
+    results = {}
+
+    results["clean.price_series"], _ = timed(lambda: clean_price_series(raw["total_price"]), repeat)
+    results["clean.area_series"], _ = timed(lambda: clean_area_series(raw["area_sqft"]), repeat)
+    results["clean.locality_series"], _ = timed(lambda: clean_locality_series(raw["locality"]), repeat)
+    if rows <= REFERENCE_MAX_ROWS:
+        results["clean.price_rowwise"], _ = timed(lambda: raw["total_price"].apply(clean_price), 1)
+        results["clean.area_rowwise"], _ = timed(lambda: raw["area_sqft"].apply(clean_area), 1)
+        results["clean.locality_rowwise"], _ = timed(lambda: raw["locality"].apply(clean_locality), 1)
+    results["clean.listings"], cleaned = timed(lambda: clean_listings(raw), repeat)
+    results["summary.groupby"], summary = timed(lambda: summarize_localities(cleaned, "2026-01-01"), repeat)
+
+    raw_path = os.path.join(workdir, f"raw_{rows}.csv")
+    raw.to_csv(raw_path, index=False)
+    results["summary.stream"], _ = timed(lambda: clean_raw_csv(raw_path), 1)
+
+    results["forecast.baseline_ols"], _ = timed(lambda: baseline_forecasts(summary, "ols"), repeat)
+    results["forecast.baseline_holt"], _ = timed(lambda: baseline_forecasts(summary, "holt"), repeat)
+
+    # The app's frame, one row per cleaned listing so it grows with the dataset
+    app_df = pd.DataFrame({
+        "locality": cleaned["locality"].to_numpy(),
+        "avg_price_per_sqft": cleaned["price_per_sqft"].to_numpy(),
+        "median_price": cleaned["total_price"].to_numpy(),
+        "total_listings": 1,
+        "scrape_date": "2026-01-01",
+    })
+    store = os.path.join(workdir, f"store_{rows}")
+    write_stage(app_df, "cleaned", root=store)
+    results["app.load_data"], _ = timed(lambda: read_stage("cleaned", columns=list(app_df.columns), latest=True,
+                                                           root=store), repeat)
+    results["app.aggregates_build"], aggregates = timed(lambda: DashboardAggregates.build(app_df), repeat)
+    results["app.index_build"], index = timed(lambda: LocalityIndex(app_df), repeat)
+
+    sample = list(index.localities[:100])
+    results["app.page_mask_x100"], _ = timed(lambda: [app_df[app_df["locality"] == loc] for loc in sample], repeat)
+    results["app.page_index_x100"], _ = timed(lambda: [index.rows(loc) for loc in sample], repeat)
+    results["app.dashboard_x100"], _ = timed(
+        lambda: [(aggregates.metrics[loc], aggregates.histograms[loc], aggregates.top(5), aggregates.bottom(5))
+                 for loc in sample], repeat)
+    return results
+
+
+def bench_prophet(repeat):
+    from batch_forecast import create_simulated_timeseries, fit_prophet, locality_seed, run_batch_forecasts
+    from uncertainty import UncertaintyConfig, bootstrap_intervals
+
+    prophet_band, bootstrap_band = UncertaintyConfig("prophet"), UncertaintyConfig("bootstrap")
+    ts_data = create_simulated_timeseries(5000, seed=locality_seed("BENCH"), end=pd.Timestamp("2026-01-01"))
+    fit_prophet(ts_data, 90)  # import and compile outside the timing
+    results = {}
+    results["forecast.prophet_single"], _ = timed(lambda: fit_prophet(ts_data, 90, uncertainty=prophet_band), repeat)
+    results["forecast.prophet_single_bootstrap"], trajectory = timed(
+        lambda: fit_prophet(ts_data, 180, uncertainty=bootstrap_band), repeat)
+
+    histories = [ts_data.assign(y=ts_data["y"] * (1 + i / 100)) for i in range(200)]
+    trajectories = [trajectory.assign(yhat=trajectory["yhat"] * (1 + i / 100)) for i in range(200)]
+    results["forecast.bootstrap_intervals_x200"], _ = timed(
+        lambda: bootstrap_intervals(histories, trajectories, bootstrap_band.samples), repeat)
+
+    df = pd.DataFrame({"locality": locality_names(16), "avg_price_per_sqft": np.linspace(3000, 9000, 16)})
+    results["forecast.prophet_batch16"], _ = timed(lambda: run_batch_forecasts(df, uncertainty=prophet_band), 1)
+    return results
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """``(size, name, baseline_s, current_s)`` for every benchmark that got slower."""
+    regressions = []
+    for size, timings in results.items():
+        for name, seconds in timings.items():
+            before = baseline.get(size, {}).get(name)
+            if before is not None and seconds > before * (1 + tolerance) and seconds - before > min_delta:
+                regressions.append((size, name, before, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks on synthetic listings and saved pages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fixtures", default="bench_fixtures", help="dir of *.html.gz result pages")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", default="bench_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, as a fraction")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="ignore slowdowns under this many seconds")
+    parser.add_argument("--skip-prophet", action="store_true")
+    args = parser.parse_args()
+
+    results = {"fixed": bench_parsing(load_fixtures(args.fixtures), args.repeat)}
+    if not args.skip_prophet:
+        results["fixed"].update(bench_prophet(args.repeat))
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.sizes:
+            print(f"Benchmarking {rows} listings...")
+            results[str(rows)] = bench_size(rows, args.repeat, workdir)
+
+    for size, timings in results.items():
+        for name, seconds in timings.items():
+            print(f"{size:>8} {name:<28} {seconds * 1000:10.1f} ms")
+
+    run = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count(), "pandas": pd.__version__, "numpy": np.__version__},
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"Saved {args.out}")
+
+    status = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance, args.min_delta)
+        for size, name, before, seconds in regressions:
+            print(f"REGRESSION {size} {name}: {before * 1000:.1f} ms -> {seconds * 1000:.1f} ms")
+        print(f"{len(regressions)} regressions against {args.baseline}.")
+        status = 1 if regressions else 0
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"Saved baseline {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
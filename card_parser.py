@@ -0,0 +1,269 @@
+import re
+import sys
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # fall back to the BeautifulSoup backend
+    lxml_html = None
+
+
+def clean_numeric_value(text):
+    if not text or "N/A" in text or "Call for Price" in text:
+        return 0
+    
+    text = text.lower().replace(',', '').strip()
+    
+    # Handle Price units
+    multiplier = 1
+    if 'lac' in text:
+        multiplier = 100000
+    elif 'cr' in text or 'crore' in text:
+        multiplier = 10000000
+        
+    # Extract decimal or integer
+    match = re.search(r"(\d+\.?\d*)", text)
+    if match:
+        return int(float(match.group(1)) * multiplier)
+    return 0
+
+def parse_listing_card(card, scrape_date, city='Nagpur'):
+    """BeautifulSoup card parser; the reference the lxml backend must match."""
+    # 1. Listing URL 
+    link_tag = card.find('a', class_='mb-srp__card__link') or \
+               card.find('a', class_='mb-srp__card--title') or \
+               card.find('a', href=True)
+    
+    listing_url = ""
+    if link_tag and 'href' in link_tag.attrs:
+        listing_url = link_tag['href']
+        if not listing_url.startswith('http'):
+            listing_url = 'https://www.magicbricks.com' + listing_url
+
+    # 2. Locality - Targeting specific location span or secondary title
+    loc_tag = card.find('span', class_='mb-srp__card--location') or \
+              card.find('div', class_='mb-srp__card__location')
+    
+    full_location = loc_tag.text.strip() if loc_tag else ""
+    
+    # If location tag is empty
+    if not full_location:
+        title_tag = card.find(['h2', 'span'], class_='mb-srp__card--title')
+        if title_tag and " in " in title_tag.text:
+            full_location = title_tag.text.split(" in ")[-1]
+    
+    # Clean locality: Take the first part before comma, uppercase
+    locality = full_location.split(',')[0].strip().upper() if full_location else "UNKNOWN"
+    # A bare city name carries no locality information
+    if locality == city.upper() or not locality: locality = "UNKNOWN"
+
+    # 3. Property Type - Deduction from title
+    title_tag = card.find(['h2', 'span'], class_='mb-srp__card--title')
+    title_text = title_tag.text.strip().lower() if title_tag else ""
+    
+    property_type = "Flat"
+    if "plot" in title_text: property_type = "Plot"
+    elif "house" in title_text: property_type = "House"
+    elif "villa" in title_text: property_type = "Villa"
+    elif "penthouse" in title_text: property_type = "Penthouse"
+
+    # 4. Total Price (Numeric)
+    price_raw = card.find('div', class_='mb-srp__card__price--amount')
+    total_price = clean_numeric_value(price_raw.text) if price_raw else 0
+
+    # 5. Area Sqft (Numeric) - More robust selectors for area
+    # Magicbricks often puts this in a div with data-summary or a summary value class
+    area_tag = card.find('div', {'data-summary': 'displayUnit'}) or \
+               card.find('div', class_='mb-srp__card__summary--value') or \
+               card.find('div', class_='mb-srp__card__area')
+    
+    area_sqft = clean_numeric_value(area_tag.text) if area_tag else 0
+
+    # 6. Price per Sqft (Numeric)
+    pps_tag = card.find('div', class_='mb-srp__card__price--size') or \
+              card.find('div', class_='mb-srp__card__pps')
+    
+    price_per_sqft = clean_numeric_value(pps_tag.text) if pps_tag else 0
+
+    # Only keep if we have meaningful data
+    if locality == "UNKNOWN" or not listing_url:
+        return None
+    return {
+        'locality': locality,
+        'property_type': property_type,
+        'total_price': total_price,
+        'area_sqft': area_sqft,
+        'price_per_sqft': price_per_sqft,
+        'scrape_date': scrape_date,
+        'listing_url': listing_url
+    }
+
+def parse_page_bs4(html, scrape_date, city='Nagpur'):
+    soup = BeautifulSoup(html, 'html.parser')
+    cards = soup.find_all('div', class_='mb-srp__card')
+    if not cards:
+        return None
+
+    records = []
+    for card in cards:
+        try:
+            record = parse_listing_card(card, scrape_date, city)
+        except Exception:
+            continue
+        if record:
+            records.append(record)
+    return records
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+if lxml_html is not None:
+    _CARDS = etree.XPath(f"//div[{_has_class('mb-srp__card')}]")
+    _LINK = etree.XPath(f"(.//a[{_has_class('mb-srp__card__link')}])[1]"
+                        f" | (.//a[{_has_class('mb-srp__card--title')}])[1]"
+                        f" | (.//a[@href])[1]")
+    _LOCATION = etree.XPath(f"(.//span[{_has_class('mb-srp__card--location')}])[1]"
+                            f" | (.//div[{_has_class('mb-srp__card__location')}])[1]")
+    _TITLE = etree.XPath(f"(.//*[self::h2 or self::span][{_has_class('mb-srp__card--title')}])[1]")
+    _PRICE = etree.XPath(f"(.//div[{_has_class('mb-srp__card__price--amount')}])[1]")
+    _AREA = etree.XPath(f"(.//div[@data-summary='displayUnit'])[1]"
+                        f" | (.//div[{_has_class('mb-srp__card__summary--value')}])[1]"
+                        f" | (.//div[{_has_class('mb-srp__card__area')}])[1]")
+    _PPS = etree.XPath(f"(.//div[{_has_class('mb-srp__card__price--size')}])[1]"
+                       f" | (.//div[{_has_class('mb-srp__card__pps')}])[1]")
+    _PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+
+def _first(matches, order):
+    # XPath unions come back in document order; honour the selector fallback order instead
+    for predicate in order:
+        for el in matches:
+            if predicate(el):
+                return el
+    return None
+
+def _classes(el):
+    return el.get('class', '').split()
+
+_LINK_ORDER = (lambda el: 'mb-srp__card__link' in _classes(el),
+               lambda el: 'mb-srp__card--title' in _classes(el),
+               lambda el: el.get('href') is not None)
+_LOCATION_ORDER = (lambda el: el.tag == 'span', lambda el: el.tag == 'div')
+_AREA_ORDER = (lambda el: el.get('data-summary') == 'displayUnit',
+               lambda el: 'mb-srp__card__summary--value' in _classes(el),
+               lambda el: 'mb-srp__card__area' in _classes(el))
+_PPS_ORDER = (lambda el: 'mb-srp__card__price--size' in _classes(el),
+              lambda el: 'mb-srp__card__pps' in _classes(el))
+
+def parse_card_lxml(card, scrape_date, city='Nagpur'):
+    link_tag = _first(_LINK(card), _LINK_ORDER)
+    href = link_tag.get('href') if link_tag is not None else None
+    listing_url = ""
+    if href is not None:
+        listing_url = href if href.startswith('http') else 'https://www.magicbricks.com' + href
+
+    titles = _TITLE(card)
+    title_raw = titles[0].text_content() if titles else None
+
+    loc_tag = _first(_LOCATION(card), _LOCATION_ORDER)
+    full_location = loc_tag.text_content().strip() if loc_tag is not None else ""
+    if not full_location and title_raw and " in " in title_raw:
+        full_location = title_raw.split(" in ")[-1]
+
+    locality = full_location.split(',')[0].strip().upper() if full_location else "UNKNOWN"
+    # A bare city name carries no locality information
+    if locality == city.upper() or not locality: locality = "UNKNOWN"
+
+    title_text = title_raw.strip().lower() if title_raw is not None else ""
+    property_type = "Flat"
+    if "plot" in title_text: property_type = "Plot"
+    elif "house" in title_text: property_type = "House"
+    elif "villa" in title_text: property_type = "Villa"
+    elif "penthouse" in title_text: property_type = "Penthouse"
+
+    prices = _PRICE(card)
+    total_price = clean_numeric_value(prices[0].text_content()) if prices else 0
+    area_tag = _first(_AREA(card), _AREA_ORDER)
+    area_sqft = clean_numeric_value(area_tag.text_content()) if area_tag is not None else 0
+    pps_tag = _first(_PPS(card), _PPS_ORDER)
+    price_per_sqft = clean_numeric_value(pps_tag.text_content()) if pps_tag is not None else 0
+
+    if locality == "UNKNOWN" or not listing_url:
+        return None
+    return {
+        'locality': locality,
+        'property_type': property_type,
+        'total_price': total_price,
+        'area_sqft': area_sqft,
+        'price_per_sqft': price_per_sqft,
+        'scrape_date': scrape_date,
+        'listing_url': listing_url
+    }
+
+def parse_page_lxml(html, scrape_date, city='Nagpur'):
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    root = lxml_html.document_fromstring(html, parser=_PARSER)
+    cards = _CARDS(root)
+    if not cards:
+        return None
+
+    records = []
+    for card in cards:
+        try:
+            record = parse_card_lxml(card, scrape_date, city)
+        except Exception:
+            continue
+        if record:
+            records.append(record)
+    return records
+
+
+BACKENDS = {'bs4': parse_page_bs4, 'lxml': parse_page_lxml}
+DEFAULT_BACKEND = 'lxml' if lxml_html is not None else 'bs4'
+
+def get_page_parser(backend=None):
+    """Returns ``parse(html, scrape_date, city)`` for a backend name.
+
+    Every backend returns the page's listing records, or None if the page has
+    no listing cards.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'lxml' and lxml_html is None:
+        raise ImportError("The lxml parser backend needs lxml: pip install lxml")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}; choose from {sorted(BACKENDS)}")
+    return BACKENDS[backend]
+
+def check_parser_parity(pages, scrape_date="2000-01-01"):
+    """Parses each saved page with both backends and returns the ones that differ.
+
+    ``pages`` maps a label (file name, URL) to the raw HTML bytes.
+    """
+    mismatches = {}
+    for label, html in pages.items():
+        expected = parse_page_bs4(html, scrape_date)
+        actual = parse_page_lxml(html, scrape_date)
+        if expected != actual:
+            mismatches[label] = (expected, actual)
+    return mismatches
+
+
+if __name__ == "__main__":
+    # python card_parser.py <PageCache dir>  -- parity check over recorded pages
+    import gzip
+    import os
+
+    cache_dir = sys.argv[1]
+    pages = {}
+    for name in sorted(os.listdir(cache_dir)):
+        if name.endswith('.html.gz'):
+            with gzip.open(os.path.join(cache_dir, name), 'rb') as f:
+                pages[name] = f.read()
+    mismatches = check_parser_parity(pages)
+    for name, (expected, actual) in mismatches.items():
+        print(f"{name}: bs4 gave {expected}\n  lxml gave {actual}")
+    print(f"{len(pages) - len(mismatches)}/{len(pages)} pages parse identically with bs4 and lxml.")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,97 @@
+import csv
+import json
+import os
+
+
+class ScrapeCheckpoint:
+    """Streams scraped rows to CSV page by page and remembers where a run stopped.
+
+    Next to ``csv_path`` it keeps ``<name>.seen`` (one listing URL per line,
+    append-only) and ``<name>.checkpoint.json`` holding the last completed page
+    and the byte length of both files at that point. On resume both files are
+    truncated back to those lengths, so a crash mid-page never duplicates rows.
+    """
+
+    def __init__(self, csv_path, fieldnames):
+        self.csv_path = csv_path
+        self.fieldnames = fieldnames
+        stem = os.path.splitext(csv_path)[0]
+        self.seen_path = stem + ".seen"
+        self.state_path = stem + ".checkpoint.json"
+        self.seen_urls = set()
+        self.state = None
+
+    def load(self):
+        """Restores an unfinished run. Returns False if there is nothing to resume."""
+        if not os.path.exists(self.state_path):
+            return False
+        with open(self.state_path) as f:
+            state = json.load(f)
+        if state.get("complete"):
+            return False
+
+        for path, size in ((self.csv_path, state["csv_bytes"]), (self.seen_path, state["seen_bytes"])):
+            if os.path.exists(path):
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+        if os.path.exists(self.seen_path):
+            with open(self.seen_path) as f:
+                self.seen_urls = {line.rstrip("\n") for line in f if line.strip()}
+        self.state = state
+        return True
+
+    def start(self, scrape_date):
+        """Begins a fresh run, discarding any previous output."""
+        for path in (self.csv_path, self.seen_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.seen_urls = set()
+        self.state = {"scrape_date": scrape_date, "last_page": 0, "rows": 0,
+                      "csv_bytes": 0, "seen_bytes": 0, "complete": False}
+        self._save_state()
+
+    @property
+    def next_page(self):
+        return self.state["last_page"] + 1
+
+    @property
+    def rows(self):
+        return self.state["rows"]
+
+    def write_page(self, page_number, records):
+        """Appends one page of already-deduplicated rows and advances the checkpoint."""
+        new_file = not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0
+        with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(records)
+            f.flush()
+            os.fsync(f.fileno())
+        with open(self.seen_path, "a", encoding="utf-8") as f:
+            f.writelines(record["listing_url"] + "\n" for record in records)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.seen_urls.update(record["listing_url"] for record in records)
+        self.state.update(last_page=page_number, rows=self.state["rows"] + len(records),
+                          csv_bytes=os.path.getsize(self.csv_path),
+                          seen_bytes=os.path.getsize(self.seen_path))
+        self._save_state()
+
+    def completed(self):
+        """Whether the last run saved here finished, read from its checkpoint file."""
+        if not os.path.exists(self.state_path):
+            return False
+        with open(self.state_path) as f:
+            return bool(json.load(f).get("complete"))
+
+    def finish(self):
+        self.state["complete"] = True
+        self._save_state()
+
+    def _save_state(self):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
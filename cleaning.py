@@ -0,0 +1,197 @@
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+NUMBER_PATTERN = r"(\d+\.?\d*)"
+
+UNWANTED_LOCALITY_WORDS = [
+    "AREA", "NAGPUR", "CITY", "DISTRICT",
+    "MAHARASHTRA", "ROAD", "PHASE",
+    "NEAR", "OPP", "OPPOSITE"
+]
+
+_DIGITS = re.compile(r"\d+")
+_NON_LETTERS = re.compile(r"[^A-Z\s]")
+_SPACES = re.compile(r"\s+")
+
+PRICE_PER_SQFT_RANGE = (500, 50000)
+
+
+# Row-level reference implementations, as first written in the cleaning notebook.
+
+def clean_price(price):
+    if pd.isna(price):
+        return np.nan
+
+    price = str(price).replace("₹", "").replace(",", "").strip().lower()
+
+    # Handle Crore
+    if "cr" in price:
+        value = float(re.findall(r"\d+\.?\d*", price)[0])
+        return value * 10000000
+
+    # Handle Lakh
+    elif "lac" in price or "lakh" in price:
+        value = float(re.findall(r"\d+\.?\d*", price)[0])
+        return value * 100000
+
+    else:
+        try:
+            return float(re.findall(r"\d+\.?\d*", price)[0])
+        except:
+            return np.nan
+
+
+def clean_area(area):
+    if pd.isna(area):
+        return np.nan
+
+    area = str(area).replace(",", "").lower()
+
+    match = re.findall(r"\d+\.?\d*", area)
+    if match:
+        return float(match[0])
+    return np.nan
+
+
+def clean_locality(locality):
+    if pd.isna(locality):
+        return None
+
+    locality = str(locality)
+    locality = locality.upper()
+
+    # Remove unwanted words
+    for word in UNWANTED_LOCALITY_WORDS:
+        locality = locality.replace(word, "")
+
+    # Remove numbers
+    locality = _DIGITS.sub("", locality)
+
+    # Remove special characters
+    locality = _NON_LETTERS.sub("", locality)
+
+    # Remove extra spaces
+    locality = _SPACES.sub(" ", locality).strip()
+
+    return locality
+
+
+# Vectorized versions. Scraped columns repeat the same strings heavily, so each
+# one works on the distinct values only and maps the result back with take().
+# The distinct values are kept as Python objects so upper() and the regexes
+# behave exactly like the row-level functions (Arrow strings would use RE2,
+# where \d and \s are ASCII-only).
+
+def _distinct(series):
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    return codes, pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+
+
+def _as_text(uniques):
+    # str() per value, kept as object dtype (astype(str) would switch to Arrow strings)
+    return uniques.map(str).astype(object)
+
+
+def _expand(codes, values, index, fill, dtype):
+    values = np.append(np.asarray(values, dtype=dtype), np.array([fill], dtype=dtype))
+    return pd.Series(values[codes], index=index, dtype=dtype)
+
+
+def clean_price_series(prices):
+    """Vectorized ``clean_price``: "₹1.2 Cr" -> 12000000.0, "85 Lac" -> 8500000.0.
+
+    Matches the row-level function value for value, except that a crore/lakh
+    string with no number gives NaN where clean_price raised IndexError.
+    """
+    codes, uniques = _distinct(prices)
+    text = (_as_text(uniques)
+            .str.replace("₹", "", regex=False)
+            .str.replace(",", "", regex=False)
+            .str.strip()
+            .str.lower())
+    number = text.str.extract(NUMBER_PATTERN, expand=False).map(_to_float)
+    multiplier = np.where(text.str.contains("cr", regex=False), 10000000,
+                          np.where(text.str.contains("lac", regex=False) | text.str.contains("lakh", regex=False),
+                                   100000, 1))
+    return _expand(codes, number.to_numpy(dtype=float) * multiplier, prices.index, np.nan, float)
+
+
+def clean_area_series(areas):
+    """Vectorized ``clean_area``: the first number in the text, units ignored."""
+    codes, uniques = _distinct(areas)
+    text = _as_text(uniques).str.replace(",", "", regex=False).str.lower()
+    number = text.str.extract(NUMBER_PATTERN, expand=False).map(_to_float)
+    return _expand(codes, number.to_numpy(dtype=float), areas.index, np.nan, float)
+
+
+def clean_locality_series(localities):
+    """Vectorized ``clean_locality``; missing values come back as None."""
+    codes, uniques = _distinct(localities)
+    text = _as_text(uniques).str.upper()
+    # Sequential, like the row-level loop: one alternation regex would remove
+    # overlapping words differently ("NEAREA").
+    for word in UNWANTED_LOCALITY_WORDS:
+        text = text.str.replace(word, "", regex=False)
+    text = (text.str.replace(_DIGITS, "", regex=True)
+            .str.replace(_NON_LETTERS, "", regex=True)
+            .str.replace(_SPACES, " ", regex=True)
+            .str.strip())
+    return _expand(codes, text.to_numpy(dtype=object), localities.index, None, object)
+
+
+def _to_float(value):
+    # float() rather than the numeric parser so non-ASCII digits match clean_price
+    return float(value) if isinstance(value, str) else np.nan
+
+
+def url_column(columns):
+    """The listing URL column among ``columns``: the scraper's ``listing_url``, or ``url``; None if neither."""
+    return next((c for c in ("listing_url", "url") if c in columns), None)
+
+
+def clean_listings(df):
+    """The notebook's row-level cleaning steps on a raw listings frame."""
+    url = url_column(df.columns)
+    if url:
+        df = df.drop_duplicates(subset=[url])
+    df = df.drop_duplicates(subset=["total_price", "locality", "area_sqft"])
+    return clean_deduplicated(df)
+
+
+def clean_deduplicated(df):
+    """Drops incomplete rows, cleans the columns and filters implausible price/sqft."""
+    df = df.dropna(subset=["total_price", "locality"])
+
+    df = df.assign(
+        total_price=clean_price_series(df["total_price"]),
+        area_sqft=clean_area_series(df["area_sqft"]),
+        locality=clean_locality_series(df["locality"]),
+    )
+    df = df[df["locality"] != ""]
+
+    if "price_per_sqft" in df.columns:
+        df = df.assign(price_per_sqft=df["price_per_sqft"].fillna(df["total_price"] / df["area_sqft"]))
+
+    low, high = PRICE_PER_SQFT_RANGE
+    return df[(df["price_per_sqft"] >= low) & (df["price_per_sqft"] <= high)]
+
+
+def summarize_localities(df, scrape_date=None):
+    """Per-locality avg price/sqft, median price and listing count, rounded as published."""
+    locality_summary = (
+        df.groupby("locality")
+          .agg(
+              avg_price_per_sqft=("price_per_sqft", "mean"),
+              median_price=("total_price", "median"),
+              total_listings=("locality", "count")
+          )
+          .reset_index()
+    )
+    locality_summary["scrape_date"] = scrape_date or datetime.today().date()
+    locality_summary["avg_price_per_sqft"] = locality_summary["avg_price_per_sqft"].round(2)
+    locality_summary["median_price"] = locality_summary["median_price"].round(0)
+    return locality_summary
@@ -0,0 +1,61 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from nagpur_data_scraping import PROPERTY_TYPES, HostBudget, scrape_magicbricks
+from rate_limiter import RateLimiter
+
+
+def parse_job(spec):
+    """``"Pune:Plots"`` -> ``("Pune", "Plots")``; the property type defaults to Flats."""
+    city, _, property_type = spec.partition(":")
+    property_type = property_type or "Flats"
+    if property_type not in PROPERTY_TYPES:
+        raise ValueError(f"Unknown property type {property_type!r}; choose from {sorted(PROPERTY_TYPES)}")
+    return city.strip(), property_type
+
+
+def run_crawl_jobs(jobs, max_parallel_jobs=3, requests_per_second=0.5, burst=2, max_retries=4,
+                   max_in_flight_per_host=2, max_requests_per_host=None, **scrape_kwargs):
+    """Runs (city, property_type) scrape jobs concurrently under one request budget.
+
+    Every job shares a single RateLimiter and HostBudget, so adding jobs adds
+    parallel parsing and disk I/O but never raises the request rate against
+    Magicbricks. Each job writes its own ``Data/<city>/<property_type>/``
+    partition. Returns ``{(city, property_type): csv_path or None}``; a job
+    that raises is reported and recorded as None without stopping the others.
+    """
+    limiter = RateLimiter(requests_per_second, burst, max_retries)
+    budget = HostBudget(max_in_flight_per_host, max_requests_per_host)
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max_parallel_jobs) as executor:
+        futures = {
+            executor.submit(scrape_magicbricks, city, property_type, limiter=limiter, budget=budget,
+                            log_prefix=f"[{city}/{property_type}] ", **scrape_kwargs): (city, property_type)
+            for city, property_type in jobs
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                results[job] = future.result()
+            except Exception as e:
+                print(f"[{job[0]}/{job[1]}] Job failed: {e}")
+                results[job] = None
+
+    print(f"\nCrawl finished: {sum(1 for path in results.values() if path)}/{len(jobs)} jobs produced data.")
+    print(f"Rate limiter: {limiter.report()}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape several Magicbricks city/property-type searches in one run.")
+    parser.add_argument("jobs", nargs="+", help="CITY[:PROPERTY_TYPE], e.g. Nagpur Pune:Plots")
+    parser.add_argument("--target", type=int, default=500, help="listings per job")
+    parser.add_argument("--parallel-jobs", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1, help="page fetch workers per job")
+    parser.add_argument("--rps", type=float, default=0.5, help="global requests per second")
+    parser.add_argument("--cache-dir", default=None)
+    args = parser.parse_args()
+
+    run_crawl_jobs([parse_job(spec) for spec in args.jobs], args.parallel_jobs, args.rps,
+                   target_count=args.target, workers=args.workers, cache_dir=args.cache_dir)
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from storage import STORE_ROOT
+
+
+AGGREGATES_DIR = os.path.join(STORE_ROOT, "dashboard")
+
+HISTOGRAM_BINS = 30
+
+
+def data_version(df):
+    """Content hash of a frame; aggregates built from it are stored under this key."""
+    hashed = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()[:16]
+
+
+class DashboardAggregates:
+    """Everything the Dashboard and Compare pages draw, computed once per data version.
+
+    ``ranking`` is locality -> mean price/sqft sorted ascending (cheapest
+    first); ``metrics`` maps locality to its metric cards; ``histograms`` maps
+    locality to ``(counts, edges)`` of its price/sqft distribution.
+    """
+
+    def __init__(self, version, ranking, metrics, histograms):
+        self.version = version
+        self.ranking = ranking
+        self.metrics = metrics
+        self.histograms = histograms
+
+    @classmethod
+    def build(cls, df, version=None, bins=HISTOGRAM_BINS):
+        by_locality = df.groupby("locality")
+        stats = by_locality.agg(
+            avg_price_sqft=("avg_price_per_sqft", "mean"),
+            median_price=("median_price", "median"),
+            listings=("locality", "size"),
+        )
+        metrics = {
+            loc: {"avg_price_sqft": row.avg_price_sqft, "median_price": row.median_price, "listings": int(row.listings)}
+            for loc, row in stats.iterrows()
+        }
+
+        histograms = {}
+        for loc, values in by_locality["avg_price_per_sqft"]:
+            counts, edges = np.histogram(values.dropna().to_numpy(), bins=bins)
+            histograms[loc] = (counts, edges)
+
+        ranking = stats["avg_price_sqft"].sort_values().rename("avg_price_per_sqft")
+        return cls(version or data_version(df), ranking, metrics, histograms)
+
+    def top(self, n=5):
+        return self.ranking.tail(n).reset_index()
+
+    def bottom(self, n=5):
+        return self.ranking.head(n).reset_index()
+
+    def stats_table(self, localities):
+        """The Compare page's per-locality table, in the order given."""
+        rows = [dict(locality=loc, **self.metrics[loc]) for loc in localities if loc in self.metrics]
+        return pd.DataFrame(rows, columns=["locality", "avg_price_sqft", "median_price", "listings"])
+
+    def save(self, directory=AGGREGATES_DIR):
+        os.makedirs(directory, exist_ok=True)
+        payload = {
+            "version": self.version,
+            "ranking": {str(loc): value for loc, value in self.ranking.items()},
+            "metrics": self.metrics,
+            "histograms": {loc: [counts.tolist(), edges.tolist()] for loc, (counts, edges) in self.histograms.items()},
+        }
+        path = os.path.join(directory, f"{self.version}.json")
+        with open(path, "w") as f:
+            json.dump(payload, f, default=float)
+        return path
+
+    @classmethod
+    def load(cls, version, directory=AGGREGATES_DIR):
+        """The aggregates saved for ``version``, or None."""
+        path = os.path.join(directory, f"{version}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            payload = json.load(f)
+        ranking = pd.Series(payload["ranking"], name="avg_price_per_sqft", dtype=float)
+        ranking.index.name = "locality"
+        histograms = {loc: (np.array(counts), np.array(edges)) for loc, (counts, edges) in payload["histograms"].items()}
+        return cls(payload["version"], ranking, payload["metrics"], histograms)
+
+    @classmethod
+    def load_or_build(cls, df, version=None, directory=AGGREGATES_DIR):
+        version = version or data_version(df)
+        aggregates = cls.load(version, directory)
+        if aggregates is None:
+            aggregates = cls.build(df, version)
+            aggregates.save(directory)
+        return aggregates
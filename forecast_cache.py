@@ -0,0 +1,81 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from page_cache import PageCache
+
+
+FORECAST_CACHE_DIR = os.environ.get("NAGPUR_RE_FORECAST_CACHE", "./cache/forecasts")
+
+
+def series_fingerprint(ts_data):
+    """Content hash of a ``ds``/``y`` training frame; the forecast's data version."""
+    hashed = pd.util.hash_pandas_object(ts_data[["ds", "y"]], index=False).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()[:16]
+
+
+def forecast_key(locality, data_version, variant=None):
+    # No horizon: entries hold the full MAX_FORECAST_DAYS trajectory, sliced on read.
+    # ``variant`` tells apart intervals computed another way (UncertaintyConfig.variant).
+    key = f"{locality}|{data_version}"
+    return f"{key}|{variant}" if variant else key
+
+
+class ForecastCache:
+    """Two-level cache of forecast frames: an in-process LRU over an on-disk PageCache.
+
+    The memory level is shared by every session of one Streamlit server (hold
+    the instance in ``st.cache_resource``); the disk level is shared with other
+    server processes and with the batch forecasting run, which writes its
+    results here so the app can serve them without fitting.
+    """
+
+    def __init__(self, cache_dir=FORECAST_CACHE_DIR, memory_entries=256, max_disk_mb=200):
+        self.memory_entries = memory_entries
+        self.disk = PageCache(cache_dir, ttl_seconds=float("inf"), max_bytes=max_disk_mb * 1024 ** 2,
+                              suffix=".parquet.gz")
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        body = self.disk.get(key)
+        with self._lock:
+            if body is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        forecast = pd.read_parquet(io.BytesIO(body))
+        self._remember(key, forecast)
+        return forecast
+
+    def put(self, key, forecast):
+        buffer = io.BytesIO()
+        forecast.to_parquet(buffer, index=False)
+        self.disk.put(key, buffer.getvalue())
+        self._remember(key, forecast)
+
+    def _remember(self, key, forecast):
+        with self._lock:
+            self._memory[key] = forecast
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        forecast = self.get(key)
+        if forecast is None:
+            forecast = compute()
+            self.put(key, forecast)
+        return forecast
@@ -14,8 +14,9 @@ import pandas as pd
 import numpy as np
 from prophet import Prophet
 import plotly.graph_objects as go
+from storage import read_stage
 
-df = pd.read_csv("nagpur_real_estate_cleaned.csv")
+df = read_stage("cleaned", columns=["locality", "scrape_date", "avg_price_per_sqft"])
 
 
 # In[56]:
@@ -72,14 +73,23 @@ def create_simulated_timeseries(df_locality, days=120):
 
 from prophet import Prophet
 import plotly.graph_objects as go
+from batch_forecast import MIN_HISTORY_POINTS, trend_label
+from timeseries_store import TimeSeriesStore
 
+from locality_index import LocalityIndex
+
+timeseries = TimeSeriesStore()
+listings_by_locality = LocalityIndex(df)
 forecast_summary = []
 
 for loc in top_localities:
     
-    data_loc_raw = df[df["locality"] == loc]
+    data_loc_raw = listings_by_locality.rows(loc)
     
-    data_loc = create_simulated_timeseries(data_loc_raw, days=120)
+    # Scraped history when there is enough of it, simulated otherwise
+    data_loc = timeseries.series(loc)
+    if len(data_loc) < MIN_HISTORY_POINTS:
+        data_loc = create_simulated_timeseries(data_loc_raw, days=120)
 
   
     model = Prophet()
@@ -150,21 +160,15 @@ for loc in top_localities:
 
     growth = ((forecast_price - current_price) / current_price) * 100
 
-    if growth > 7:
-        trend_label = "↑ Rising"
-    elif growth > 2:
-        trend_label = "↑ Stable"
-    elif growth < -2:
-        trend_label = "↓ Falling"
-    else:
-        trend_label = "→ Flat"
+    # Thresholds checked against held-out data by backtest.py
+    label = trend_label(growth)
 
     forecast_summary.append([
         loc,
         round(current_price, 2),
         round(forecast_price, 2),
         round(growth, 2),
-        trend_label
+        label
     ])
 
 
@@ -0,0 +1,190 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+
+METRICS_LOG = os.environ.get("NAGPUR_RE_METRICS_LOG", "./logs/pipeline_metrics.jsonl")
+# Textfile for a Prometheus node_exporter textfile collector; unset to skip
+PROMETHEUS_FILE = os.environ.get("NAGPUR_RE_PROMETHEUS_FILE")
+
+
+def _peak_rss_mb(who):
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 ** 2 if sys.platform == "darwin" else 1024), 1)
+
+
+def _cpu_seconds():
+    # Includes worker processes once they have exited (e.g. a closed process pool)
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class StageRecord:
+    """What one stage reports: set ``rows_out`` and watch caches while it runs."""
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.caches = {}
+        self._watched = {}
+        self.extra = {}
+        self._wall = time.perf_counter()
+        self._cpu = _cpu_seconds()
+        self.started = datetime.now().isoformat(timespec="seconds")
+
+    def watch_cache(self, name, cache):
+        """Counts a cache's hits and misses (PageCache, ForecastCache) from now until the stage finishes."""
+        if cache is not None:
+            self._watched[name] = (cache, cache.hits, cache.misses)
+
+    def _read_caches(self):
+        for name, (cache, hits, misses) in self._watched.items():
+            self.caches[name] = {"hits": cache.hits - hits, "misses": cache.misses - misses}
+
+    def to_dict(self):
+        return {
+            "stage": self.name,
+            "started": self.started,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "peak_rss_mb": self.peak_rss_mb,
+            "children_peak_rss_mb": self.children_peak_rss_mb,
+            "caches": {name: dict(counts, hit_rate=_hit_rate(counts)) for name, counts in self.caches.items()},
+            **self.extra,
+        }
+
+
+def _hit_rate(counts):
+    total = counts["hits"] + counts["misses"]
+    return round(counts["hits"] / total, 4) if total else None
+
+
+class PipelineMetrics:
+    """Per-stage timings, row counts, memory and cache hit rates for one pipeline run.
+
+    Every finished stage and every forecast fit is appended to ``log_path`` as
+    one JSON line tagged with the run id. Peak RSS is the process high-water
+    mark when the stage finished (and, separately, that of the largest exited
+    worker process); CPU time is process-wide, so stages running concurrently
+    in threads share it.
+    """
+
+    def __init__(self, run_name="pipeline", log_path=METRICS_LOG, prometheus_path=PROMETHEUS_FILE):
+        self.run_id = f"{run_name}-{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}"
+        self.log_path = log_path
+        self.prometheus_path = prometheus_path
+        self.stages = []
+        self.fits = []
+        self._lock = threading.Lock()
+
+    def start_stage(self, name, rows_in=None):
+        return StageRecord(name, rows_in)
+
+    def finish_stage(self, stage, rows_out=None):
+        stage.wall_seconds = time.perf_counter() - stage._wall
+        stage.cpu_seconds = _cpu_seconds() - stage._cpu
+        stage.peak_rss_mb = _peak_rss_mb(resource.RUSAGE_SELF) if resource else None
+        stage.children_peak_rss_mb = _peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None
+        if rows_out is not None:
+            stage.rows_out = rows_out
+        stage._read_caches()
+
+        record = stage.to_dict()
+        with self._lock:
+            self.stages.append(record)
+        self.emit("stage", record)
+        print(f"[metrics] {stage.name}: {stage.wall_seconds:.2f}s wall, {stage.cpu_seconds:.2f}s CPU, "
+              f"rows {stage.rows_in} -> {stage.rows_out}, peak RSS {record['peak_rss_mb']} MB")
+        return record
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """``with metrics.stage("clean", rows_in=len(df)) as stage: ...; stage.rows_out = len(df)``"""
+        record = self.start_stage(name, rows_in)
+        try:
+            yield record
+        except Exception as e:
+            record.extra["error"] = str(e)
+            raise
+        finally:
+            self.finish_stage(record)
+
+    def record_fit(self, locality, seconds, mode):
+        """One locality's forecast fit; ``mode`` is cold, warm, reused or failed."""
+        fit = {"locality": locality, "seconds": round(seconds, 4), "mode": mode}
+        with self._lock:
+            self.fits.append(fit)
+        self.emit("fit", fit)
+
+    def slowest_fits(self, n=10):
+        return sorted(self.fits, key=lambda fit: fit["seconds"], reverse=True)[:n]
+
+    def emit(self, kind, payload):
+        if not self.log_path:
+            return
+        line = json.dumps({"run_id": self.run_id, "event": kind, **payload}, default=str)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            with open(self.log_path, "a") as f:
+                f.write(line + "\n")
+
+    def write_prometheus(self, path=None):
+        """Writes the run's metrics in Prometheus text format, if a path is configured."""
+        path = path or self.prometheus_path
+        if not path:
+            return None
+
+        lines = []
+
+        def gauge(name, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            # A stage or locality seen twice in one run keeps its last value
+            latest = {tuple(labels.items()): value for labels, value in samples if value is not None}
+            for labels, value in latest.items():
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+                lines.append(f"{name}{{{label_text}}} {value}")
+
+        stages = self.stages
+        gauge("nagpur_re_stage_wall_seconds", "Stage wall-clock time.",
+              [({"stage": s["stage"]}, s["wall_seconds"]) for s in stages])
+        gauge("nagpur_re_stage_cpu_seconds", "Stage CPU time, process-wide.",
+              [({"stage": s["stage"]}, s["cpu_seconds"]) for s in stages])
+        gauge("nagpur_re_stage_rows_in", "Rows entering the stage.",
+              [({"stage": s["stage"]}, s["rows_in"]) for s in stages])
+        gauge("nagpur_re_stage_rows_out", "Rows leaving the stage.",
+              [({"stage": s["stage"]}, s["rows_out"]) for s in stages])
+        gauge("nagpur_re_stage_peak_rss_megabytes", "Process peak RSS when the stage finished.",
+              [({"stage": s["stage"]}, s["peak_rss_mb"]) for s in stages])
+        gauge("nagpur_re_cache_hit_ratio", "Cache hit ratio during the stage.",
+              [({"stage": s["stage"], "cache": name}, c["hit_rate"])
+               for s in stages for name, c in s["caches"].items()])
+        gauge("nagpur_re_forecast_fit_seconds", "Per-locality forecast fit time.",
+              [({"locality": f["locality"], "mode": f["mode"]}, f["seconds"]) for f in self.fits])
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        # Atomic, so a collector never reads a half-written file
+        os.replace(tmp_path, path)
+        return path
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,130 @@
+import sqlite3
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    listing_url TEXT PRIMARY KEY,
+    locality TEXT,
+    property_type TEXT,
+    area_sqft REAL,
+    total_price REAL,
+    price_per_sqft REAL,
+    first_seen TEXT,
+    last_seen TEXT,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS price_history (
+    listing_url TEXT,
+    scrape_date TEXT,
+    change_type TEXT,
+    total_price REAL,
+    previous_price REAL
+);
+CREATE INDEX IF NOT EXISTS price_history_url ON price_history (listing_url, scrape_date);
+CREATE INDEX IF NOT EXISTS listings_last_seen ON listings (status, last_seen);
+"""
+
+CHANGE_COLUMNS = ['change_type', 'previous_price', 'previous_price_per_sqft']
+
+
+class ListingIndex:
+    """Persistent SQLite index of every listing URL seen and its last price.
+
+    ``observe`` classifies a page of scraped rows as new, changed (price moved)
+    or unchanged and records new/changed ones in ``price_history``.
+    ``mark_delisted`` flags active listings that a complete crawl did not see.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def observe(self, records, scrape_date):
+        """Returns ``(changes, known_count)`` for one page of records.
+
+        ``changes`` are the new and changed records with ``change_type``,
+        ``previous_price`` and ``previous_price_per_sqft`` filled in;
+        ``known_count`` is how many records were already in the index as
+        active listings.
+        """
+        urls = [record['listing_url'] for record in records]
+        previous = {}
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT listing_url, total_price, status, price_per_sqft FROM listings "
+                f"WHERE listing_url IN ({','.join('?' * len(chunk))})",
+                chunk)
+            previous.update((url, (price, status, pps)) for url, price, status, pps in rows)
+
+        changes = []
+        known_count = 0
+        with self.conn:
+            for record in records:
+                url = record['listing_url']
+                if url in previous and previous[url][1] == 'active':
+                    known_count += 1
+                old_price = previous[url][0] if url in previous else None
+                old_pps = previous[url][2] if url in previous else None
+
+                if url not in previous or previous[url][1] != 'active':
+                    change_type = 'new'
+                elif old_price != record['total_price']:
+                    change_type = 'changed'
+                else:
+                    change_type = None
+
+                self.conn.execute(
+                    "INSERT INTO listings VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'active') "
+                    "ON CONFLICT(listing_url) DO UPDATE SET locality=excluded.locality, "
+                    "property_type=excluded.property_type, area_sqft=excluded.area_sqft, "
+                    "total_price=excluded.total_price, price_per_sqft=excluded.price_per_sqft, "
+                    "last_seen=excluded.last_seen, status='active'",
+                    (url, record['locality'], record['property_type'], record['area_sqft'],
+                     record['total_price'], record['price_per_sqft'], scrape_date, scrape_date))
+                if change_type:
+                    self.conn.execute("INSERT INTO price_history VALUES (?, ?, ?, ?, ?)",
+                                      (url, scrape_date, change_type, record['total_price'], old_price))
+                    changes.append(dict(record, change_type=change_type, previous_price=old_price,
+                                        previous_price_per_sqft=old_pps if change_type == 'changed' else None))
+        return changes, known_count
+
+    def mark_delisted(self, scrape_date):
+        """Flags active listings not seen on ``scrape_date`` and returns them as change rows.
+
+        Only meaningful after a crawl that walked every result page.
+        """
+        rows = self.conn.execute(
+            "SELECT listing_url, locality, property_type, area_sqft, total_price, price_per_sqft "
+            "FROM listings WHERE status = 'active' AND last_seen < ?", (scrape_date,)).fetchall()
+        changes = []
+        with self.conn:
+            for url, locality, property_type, area_sqft, total_price, price_per_sqft in rows:
+                self.conn.execute("UPDATE listings SET status = 'delisted' WHERE listing_url = ?", (url,))
+                self.conn.execute("INSERT INTO price_history VALUES (?, ?, 'delisted', ?, ?)",
+                                  (url, scrape_date, None, total_price))
+                changes.append({
+                    'locality': locality,
+                    'property_type': property_type,
+                    'total_price': None,
+                    'area_sqft': area_sqft,
+                    'price_per_sqft': price_per_sqft,
+                    'scrape_date': scrape_date,
+                    'listing_url': url,
+                    'change_type': 'delisted',
+                    'previous_price': total_price,
+                    'previous_price_per_sqft': price_per_sqft,
+                })
+        return changes
+
+    def price_history(self, listing_url=None):
+        query = "SELECT listing_url, scrape_date, change_type, total_price, previous_price FROM price_history"
+        params = ()
+        if listing_url:
+            query += " WHERE listing_url = ?"
+            params = (listing_url,)
+        return self.conn.execute(query + " ORDER BY listing_url, scrape_date", params).fetchall()
+
+    def close(self):
+        self.conn.close()
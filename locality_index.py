@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+
+class LocalityIndex:
+    """Listings sorted by locality code, with each locality's row range precomputed.
+
+    Built once per loaded frame; ``rows(loc)`` is then a positional slice of
+    the sorted frame (no scan, no copy) and ``values(loc, column)`` a NumPy
+    view of one column. Rows without a locality sort first and belong to no
+    locality.
+    """
+
+    def __init__(self, df, column="locality"):
+        codes, self.localities = pd.factorize(df[column], sort=True)
+        order = np.argsort(codes, kind="stable")
+        self.frame = df.iloc[order].reset_index(drop=True)
+
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.localities))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(codes < 0)
+        self._codes = {loc: code for code, loc in enumerate(self.localities)}
+
+    def __len__(self):
+        return len(self.localities)
+
+    def __contains__(self, locality):
+        return locality in self._codes
+
+    def _range(self, locality):
+        code = self._codes.get(locality)
+        if code is None:
+            return 0, 0
+        return self.offsets[code], self.offsets[code + 1]
+
+    def rows(self, locality):
+        """The locality's listings; empty if it is not in the index."""
+        start, stop = self._range(locality)
+        return self.frame.iloc[start:stop]
+
+    def values(self, locality, column):
+        start, stop = self._range(locality)
+        return self.frame[column].to_numpy()[start:stop]
+
+    def take(self, localities):
+        """Rows for several localities, in index order."""
+        codes = sorted(self._codes[loc] for loc in set(localities) if loc in self._codes)
+        if not codes:
+            return self.frame.iloc[0:0]
+        return pd.concat([self.frame.iloc[self.offsets[c]:self.offsets[c + 1]] for c in codes])
+
+    def groups(self):
+        """``(locality, rows)`` for every locality, like iterating a groupby."""
+        for code, loc in enumerate(self.localities):
+            yield loc, self.frame.iloc[self.offsets[code]:self.offsets[code + 1]]
@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from cleaning import clean_deduplicated
+from quantile_sketch import QuantileSketch
+from storage import STORE_ROOT
+
+
+SUMMARY_STATE_PATH = os.path.join(STORE_ROOT, "locality_summary_state.json")
+
+
+class LocalitySummaryState:
+    """Running per-locality sums, counts and median sketches.
+
+    Folding cleaned listings in chunk by chunk builds the same table as
+    cleaning.summarize_localities. Averages and counts are exact. Medians are
+    exact for localities with up to ``exact_limit`` listings; above that they
+    come from a QuantileSketch and are within ``relative_accuracy``.
+
+    Listings can be taken out again with ``remove``, so a state saved to disk
+    can be kept current from each day's changes file (see apply_changes)
+    instead of being rebuilt from the full history. ``urls`` holds the
+    listing URLs counted so far, so only those can be removed.
+    """
+
+    def __init__(self, relative_accuracy=0.01, exact_limit=64):
+        self.relative_accuracy = relative_accuracy
+        self.exact_limit = exact_limit
+        self.sums = {}
+        self.counts = {}
+        self.sketches = {}
+        # Listing URLs folded in by seed_state and apply_changes
+        self.urls = set()
+        # Scrape dates whose changes have been folded in
+        self.applied = set()
+
+    def _sketch(self, locality):
+        if locality not in self.sketches:
+            self.sketches[locality] = QuantileSketch(self.relative_accuracy, self.exact_limit)
+        return self.sketches[locality]
+
+    def add(self, df):
+        """Folds in cleaned listings (``locality``, ``price_per_sqft``, ``total_price``)."""
+        grouped = df.groupby("locality", sort=False)
+        totals = grouped["price_per_sqft"].agg(["sum", "count"])
+        for locality, row in totals.iterrows():
+            self.sums[locality] = self.sums.get(locality, 0.0) + row["sum"]
+            self.counts[locality] = self.counts.get(locality, 0) + int(row["count"])
+        for locality, prices in grouped["total_price"]:
+            self._sketch(locality).update(prices.dropna())
+
+    def remove(self, df):
+        """Takes out cleaned listings that were folded in earlier.
+
+        Rows the state cannot have counted are skipped: a ``listing_url``
+        not in ``urls`` (e.g. a listing the ListingIndex tracked before the
+        state was seeded), an unknown locality, or a total price the
+        locality's sketch does not hold. Every row is checked before anything
+        changes, so a skipped row touches nothing and counts never go
+        negative. Returns the number of rows skipped.
+        """
+        keep = np.zeros(len(df), dtype=bool)
+        prices = df["total_price"].to_numpy(dtype=float)
+        if "listing_url" in df.columns:
+            counted = (df["listing_url"].isin(self.urls) & ~df["listing_url"].duplicated()).to_numpy()
+        else:
+            counted = np.ones(len(df), dtype=bool)
+        for locality, positions in df.groupby("locality", sort=False).indices.items():
+            if self.counts.get(locality, 0) > 0 and locality in self.sketches:
+                positions = positions[counted[positions]]
+                keep[positions] = self.sketches[locality].removable(prices[positions])
+        removed = df[keep]
+        if "listing_url" in removed.columns:
+            self.urls.difference_update(removed["listing_url"])
+
+        grouped = removed.groupby("locality", sort=False)
+        totals = grouped["price_per_sqft"].agg(["sum", "count"])
+        for locality, row in totals.iterrows():
+            self.sums[locality] -= row["sum"]
+            self.counts[locality] -= int(row["count"])
+        for locality, group_prices in grouped["total_price"]:
+            sketch = self.sketches[locality]
+            for price in group_prices:
+                sketch.remove(float(price))
+        return len(df) - len(removed)
+
+    def merge(self, other):
+        for locality, count in other.counts.items():
+            self.sums[locality] = self.sums.get(locality, 0.0) + other.sums[locality]
+            self.counts[locality] = self.counts.get(locality, 0) + count
+        for locality, sketch in other.sketches.items():
+            self._sketch(locality).merge(sketch)
+        self.urls |= other.urls
+        self.applied |= other.applied
+        return self
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "exact_limit": self.exact_limit,
+            "sums": self.sums,
+            "counts": self.counts,
+            "sketches": {locality: sketch.to_dict() for locality, sketch in self.sketches.items()},
+            "urls": sorted(self.urls),
+            "applied": sorted(self.applied),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        summary = cls(state["relative_accuracy"], state["exact_limit"])
+        summary.sums = state["sums"]
+        summary.counts = state["counts"]
+        summary.sketches = {locality: QuantileSketch.from_dict(sketch)
+                            for locality, sketch in state["sketches"].items()}
+        summary.urls = set(state["urls"])
+        summary.applied = set(state["applied"])
+        return summary
+
+    def save(self, path=SUMMARY_STATE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=SUMMARY_STATE_PATH):
+        """The saved state, or None if there is none yet."""
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def to_frame(self, scrape_date=None):
+        """The ``locality_summary`` table, rounded like summarize_localities."""
+        localities = sorted(locality for locality, count in self.counts.items() if count > 0)
+        locality_summary = pd.DataFrame({
+            "locality": localities,
+            "avg_price_per_sqft": [self.sums[loc] / self.counts[loc] for loc in localities],
+            "median_price": [self.sketches[loc].median() if loc in self.sketches else float("nan")
+                             for loc in localities],
+            "total_listings": [self.counts[loc] for loc in localities],
+        })
+        locality_summary["scrape_date"] = scrape_date or datetime.today().date()
+        locality_summary["avg_price_per_sqft"] = locality_summary["avg_price_per_sqft"].round(2)
+        locality_summary["median_price"] = locality_summary["median_price"].round(0)
+        return locality_summary
+
+
+def seed_state(raw_df, url_column="listing_url"):
+    """A state holding every listing in a full raw scrape.
+
+    Drops repeated URLs only, unlike clean_listings, which also drops
+    repeated (total_price, locality, area_sqft) rows: the changes files
+    identify listings by URL, so every URL the ListingIndex tracks has to be
+    in the state for its later removal to cancel out.
+    """
+    if url_column in raw_df.columns:
+        raw_df = raw_df.drop_duplicates(subset=[url_column])
+    cleaned = clean_deduplicated(raw_df)
+    state = LocalitySummaryState()
+    state.add(cleaned)
+    if url_column in cleaned.columns:
+        state.urls.update(cleaned[url_column])
+    return state
+
+
+def apply_changes(state, changes, scrape_date=None):
+    """Folds one changes file (the scraper's incremental output) into ``state``.
+
+    New listings are added; changed ones swap their previous price for the
+    new one; delisted ones are removed, using ``previous_price`` and
+    ``previous_price_per_sqft``. Removed rows go through the same cleaning as
+    added ones, so a listing the price/sqft filter dropped when it was added
+    is dropped again rather than subtracted; a removal the state never
+    counted is skipped (see LocalitySummaryState.remove). A scrape date that
+    was already applied is skipped. Returns the number of listing rows added
+    and removed.
+    """
+    if scrape_date is None and "scrape_date" in changes.columns and len(changes):
+        scrape_date = str(changes["scrape_date"].iloc[0])
+    if scrape_date in state.applied:
+        print(f"Changes for {scrape_date} already applied, skipping.")
+        return 0
+
+    added = changes[changes["change_type"].isin(["new", "changed"])]
+    removed = changes[changes["change_type"].isin(["changed", "delisted"])].assign(
+        total_price=lambda d: d["previous_price"],
+        price_per_sqft=lambda d: d["previous_price_per_sqft"],
+    )
+    added, removed = clean_deduplicated(added), clean_deduplicated(removed)
+    skipped = state.remove(removed)
+    if skipped:
+        print(f"Skipped {skipped} removals of listings the summary state never counted.")
+    state.add(added)
+    state.urls.update(added["listing_url"])
+    if scrape_date is not None:
+        state.applied.add(scrape_date)
+    return len(added) + len(removed) - skipped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Update the locality summary from a day's changes file instead of the full history.")
+    parser.add_argument("changes_csv", nargs="*", help="changes files from incremental scrapes, oldest first")
+    parser.add_argument("--seed", default=None, help="start over from this full raw CSV")
+    parser.add_argument("--state", default=SUMMARY_STATE_PATH)
+    parser.add_argument("--out", default="nagpur_real_estate_cleaned.csv")
+    parser.add_argument("--publish", action="store_true",
+                        help="also write the cleaned stage and append to the price history")
+    args = parser.parse_args()
+
+    if args.seed:
+        state = seed_state(pd.read_csv(args.seed))
+    else:
+        state = LocalitySummaryState.load(args.state)
+        if state is None:
+            parser.error(f"No saved state at {args.state}; run with --seed first")
+    for path in args.changes_csv:
+        rows = apply_changes(state, pd.read_csv(path))
+        print(f"Applied {rows} listing rows from {path}.")
+    state.save(args.state)
+
+    locality_summary = state.to_frame()
+    locality_summary.to_csv(args.out, index=False)
+    print(f"Saved {args.out} ({len(locality_summary)} localities)")
+    if args.publish:
+        from storage import write_stage
+        from timeseries_store import TimeSeriesStore
+        write_stage(locality_summary, "cleaned")
+        timeseries = TimeSeriesStore()
+        timeseries.append(locality_summary)
+        timeseries.close()
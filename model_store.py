@@ -0,0 +1,60 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+MODEL_DIR = os.environ.get("NAGPUR_RE_MODEL_DIR", "./cache/models")
+
+
+class ModelStore:
+    """Fitted Prophet models on disk, one JSON file per locality.
+
+    Each file holds Prophet's own JSON serialization next to the fingerprint
+    of the series the model was trained on (forecast_cache.series_fingerprint).
+    """
+
+    def __init__(self, model_dir=MODEL_DIR):
+        self.model_dir = model_dir
+        os.makedirs(model_dir, exist_ok=True)
+
+    def _path(self, locality):
+        return os.path.join(self.model_dir, hashlib.sha1(str(locality).encode("utf-8")).hexdigest()[:16] + ".json")
+
+    def load(self, locality):
+        """Returns ``(fingerprint, model)`` or ``(None, None)`` if nothing usable is stored."""
+        from prophet.serialize import model_from_json
+
+        path = self._path(locality)
+        if not os.path.exists(path):
+            return None, None
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            return entry["fingerprint"], model_from_json(entry["model"])
+        except (ValueError, KeyError):
+            return None, None
+
+    def save(self, locality, fingerprint, model):
+        from prophet.serialize import model_to_json
+
+        path = self._path(locality)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"locality": locality, "fingerprint": fingerprint, "model": model_to_json(model)}, f)
+        os.replace(tmp_path, path)
+
+
+def warm_start_params(model):
+    """A fitted model's parameters in the form ``Prophet.fit(init=...)`` takes.
+
+    Passing these as the optimizer's starting point for the next day's fit
+    usually converges in a fraction of the iterations of a cold start.
+    """
+    params = {}
+    for name in ("k", "m", "sigma_obs"):
+        params[name] = model.params[name][0][0] if model.mcmc_samples == 0 else np.mean(model.params[name])
+    for name in ("delta", "beta"):
+        params[name] = model.params[name][0] if model.mcmc_samples == 0 else np.mean(model.params[name], axis=0)
+    return params
@@ -5,13 +5,19 @@
 
 
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import os
-import time
-import random
-import re
 from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlparse
+
+from card_parser import get_page_parser
+from checkpoint import ScrapeCheckpoint
+from listing_index import CHANGE_COLUMNS, ListingIndex
+from page_cache import PageCache
+from rate_limiter import BudgetExhausted, RateLimiter
 
 
 # In[7]:
@@ -40,170 +46,313 @@ def get_headers(referer=None):
         base_headers['referer'] = referer
     return base_headers
 
-def setup_directories():
-    path = os.path.join(project_dir, f'Data/{City}/Flats/')
+# Search filters per output partition. 'Flats' is the original all-residential
+# search and keeps its historical folder name.
+PROPERTY_TYPES = {
+    'Flats': 'Multistorey-Apartment,Builder-Floor-Apartment,Penthouse,Studio-Apartment,Residential-House,Villas,Residential-Plot',
+    'Apartments': 'Multistorey-Apartment,Builder-Floor-Apartment,Penthouse,Studio-Apartment',
+    'Houses': 'Residential-House,Villas',
+    'Plots': 'Residential-Plot',
+}
+
+def setup_directories(city=City, property_type='Flats'):
+    path = os.path.join(project_dir, f'Data/{city}/{property_type}/')
     if not os.path.exists(path):
         os.makedirs(path)
     return path
 
-def clean_numeric_value(text):
-    if not text or "N/A" in text or "Call for Price" in text:
-        return 0
-    
-    text = text.lower().replace(',', '').strip()
-    
-    # Handle Price units
-    multiplier = 1
-    if 'lac' in text:
-        multiplier = 100000
-    elif 'cr' in text or 'crore' in text:
-        multiplier = 10000000
-        
-    # Extract decimal or integer
-    match = re.search(r"(\d+\.?\d*)", text)
-    if match:
-        return int(float(match.group(1)) * multiplier)
-    return 0
-
-def scrape_nagpur_magicbricks(target_count=500):
-    output_folder = setup_directories()
-    all_data = []
-    scrape_date = datetime.now().strftime("%Y-%m-%d")
-    session = requests.Session()
-    
-    print("Initializing session...")
-    try:
-        session.get("https://www.magicbricks.com/", headers=get_headers(), timeout=15)
-        time.sleep(random.uniform(2, 4))
-    except: 
-        print("Initial session warm-up failed, continuing anyway...")
-
-    print(f"Starting Nagpur Scrape (Magicbricks) | Target: All listed (up to {target_count})")
-
-    page_number = 1
-    while len(all_data) < target_count:
-        url = f'https://www.magicbricks.com/property-for-sale/residential-real-estate?&proptype=Multistorey-Apartment,Builder-Floor-Apartment,Penthouse,Studio-Apartment,Residential-House,Villas,Residential-Plot&cityName={City}&page={page_number}'
-        referer = "https://www.magicbricks.com/" if page_number == 1 else f'https://www.magicbricks.com/property-for-sale/residential-real-estate?&cityName={City}&page={page_number-1}'
-        
+BASE_URL = "https://www.magicbricks.com/"
+
+def build_page_url(page_number, city=City, property_type='Flats'):
+    return f'https://www.magicbricks.com/property-for-sale/residential-real-estate?&proptype={PROPERTY_TYPES[property_type]}&cityName={city}&page={page_number}'
+
+def build_referer(page_number, city=City):
+    if page_number == 1:
+        return BASE_URL
+    return f'https://www.magicbricks.com/property-for-sale/residential-real-estate?&cityName={city}&page={page_number-1}'
+
+class HostBudget:
+    """Caps in-flight and total requests per host across all fetch workers.
+
+    RateLimiter.get charges every attempt, retries included, and releases
+    the slot before backing off.
+    """
+
+    def __init__(self, max_in_flight=2, max_requests=None):
+        self.max_in_flight = max_in_flight
+        self.max_requests = max_requests
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._issued = {}
+
+    def acquire(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            issued = self._issued.get(host, 0)
+            if self.max_requests is not None and issued >= self.max_requests:
+                return None
+            self._issued[host] = issued + 1
+            slot = self._slots.setdefault(host, threading.BoundedSemaphore(self.max_in_flight))
+        slot.acquire()
+        return slot
+
+    def requests_issued(self, url):
+        with self._lock:
+            return self._issued.get(urlparse(url).netloc, 0)
+
+
+def fetch_listing_page(session, page_number, scrape_date, budget=None, limiter=None, cache=None, parse_page=None,
+                       city=City, property_type='Flats'):
+    """Fetches and parses one search page, paced and retried by ``limiter``.
+
+    Pages found in ``cache`` skip the network entirely; in replay mode a cache
+    miss ends the crawl instead of fetching.
+
+    Returns a ``(status, records)`` pair where status is one of ``"ok"``,
+    ``"blocked"``, ``"empty"``, ``"budget"``, ``"miss"`` or ``"error"``.
+    """
+    url = build_page_url(page_number, city, property_type)
+    html = cache.get(url) if cache else None
+
+    if html is None:
+        if cache and cache.replay:
+            return "miss", None
         try:
-            response = session.get(url, headers=get_headers(referer), timeout=25)
-            if response.status_code == 403:
-                print(f"IP Blocked (403) at page {page_number}.")
-                break
+            response = limiter.get(session, url, budget=budget,
+                                   headers=get_headers(build_referer(page_number, city)), timeout=25)
+        except BudgetExhausted:
+            return "budget", None
+        except Exception as e:
+            return "error", e
+        if response.status_code in (403, 429):
+            return "blocked", None
+        if response.status_code != 200:
+            return "error", f"HTTP {response.status_code}"
+        html = response.content
+        if cache:
+            cache.put(url, html)
 
-            soup = BeautifulSoup(response.content, 'html.parser')
-            cards = soup.find_all('div', class_='mb-srp__card')
-            
-            if not cards:
-                print(f"No listings found on page {page_number}. Ending.")
-                break
+    try:
+        records = (parse_page or get_page_parser())(html, scrape_date, city)
+    except Exception as e:
+        return "error", e
+    if records is None:
+        return "empty", None
+    return "ok", records
+
+def iter_listing_pages(session, scrape_date, workers=1, budget=None, limiter=None, cache=None, start_page=1,
+                       parser=None, city=City, property_type='Flats'):
+    """Yields ``(page_number, status, records)`` in page order.
+
+    With ``workers > 1`` up to that many pages are fetched and parsed ahead on a
+    thread pool, each worker on its own copy of the warmed-up session. Iteration
+    ends after the first page whose status is not ``"ok"``.
+    """
+    limiter = limiter or RateLimiter()
+    fetch = partial(fetch_listing_page, scrape_date=scrape_date, budget=budget, limiter=limiter, cache=cache,
+                    parse_page=get_page_parser(parser), city=city, property_type=property_type)
+    if workers <= 1:
+        page_number = start_page
+        while True:
+            status, records = fetch(session, page_number)
+            yield page_number, status, records
+            if status != "ok":
+                return
+            page_number += 1
+
+    local = threading.local()
 
-            for card in cards:
-                try:
-                    # 1. Listing URL 
-                    link_tag = card.find('a', class_='mb-srp__card__link') or \
-                               card.find('a', class_='mb-srp__card--title') or \
-                               card.find('a', href=True)
-                    
-                    listing_url = ""
-                    if link_tag and 'href' in link_tag.attrs:
-                        listing_url = link_tag['href']
-                        if not listing_url.startswith('http'):
-                            listing_url = 'https://www.magicbricks.com' + listing_url
-
-                    # 2. Locality - Targeting specific location span or secondary title
-                    loc_tag = card.find('span', class_='mb-srp__card--location') or \
-                              card.find('div', class_='mb-srp__card__location')
-                    
-                    full_location = loc_tag.text.strip() if loc_tag else ""
-                    
-                    # If location tag is empty
-                    if not full_location:
-                        title_tag = card.find(['h2', 'span'], class_='mb-srp__card--title')
-                        if title_tag and " in " in title_tag.text:
-                            full_location = title_tag.text.split(" in ")[-1]
-                    
-                    # Clean locality: Take the first part before comma, uppercase
-                    locality = full_location.split(',')[0].strip().upper() if full_location else "UNKNOWN"
-                    if locality == "NAGPUR" or not locality: locality = "UNKNOWN"
-
-                    # 3. Property Type - Deduction from title
-                    title_tag = card.find(['h2', 'span'], class_='mb-srp__card--title')
-                    title_text = title_tag.text.strip().lower() if title_tag else ""
-                    
-                    property_type = "Flat"
-                    if "plot" in title_text: property_type = "Plot"
-                    elif "house" in title_text: property_type = "House"
-                    elif "villa" in title_text: property_type = "Villa"
-                    elif "penthouse" in title_text: property_type = "Penthouse"
-
-                    # 4. Total Price (Numeric)
-                    price_raw = card.find('div', class_='mb-srp__card__price--amount')
-                    total_price = clean_numeric_value(price_raw.text) if price_raw else 0
-
-                    # 5. Area Sqft (Numeric) - More robust selectors for area
-                    # Magicbricks often puts this in a div with data-summary or a summary value class
-                    area_tag = card.find('div', {'data-summary': 'displayUnit'}) or \
-                               card.find('div', class_='mb-srp__card__summary--value') or \
-                               card.find('div', class_='mb-srp__card__area')
-                    
-                    area_sqft = clean_numeric_value(area_tag.text) if area_tag else 0
-
-                    # 6. Price per Sqft (Numeric)
-                    pps_tag = card.find('div', class_='mb-srp__card__price--size') or \
-                              card.find('div', class_='mb-srp__card__pps')
-                    
-                    price_per_sqft = clean_numeric_value(pps_tag.text) if pps_tag else 0
-
-                    # Only append if we have meaningful data
-                    if locality != "UNKNOWN" and listing_url:
-                        all_data.append({
-                            'locality': locality,
-                            'property_type': property_type,
-                            'total_price': total_price,
-                            'area_sqft': area_sqft,
-                            'price_per_sqft': price_per_sqft,
-                            'scrape_date': scrape_date,
-                            'listing_url': listing_url
-                        })
-                    
-                    if len(all_data) >= target_count: break
-                    
-                except Exception:
-                    continue
-
-            print(f"Page {page_number}: Collected {len(all_data)} items.")
+    def worker_session():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            local.session.cookies.update(session.cookies)
+        return local.session
+
+    def task(page_number):
+        return fetch(worker_session(), page_number)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+    next_submit = start_page
+    try:
+        page_number = start_page
+        while True:
+            while len(pending) < workers:
+                pending[next_submit] = executor.submit(task, next_submit)
+                next_submit += 1
+            status, records = pending.pop(page_number).result()
+            yield page_number, status, records
+            if status != "ok":
+                return
             page_number += 1
-            time.sleep(random.uniform(10, 15))
+    finally:
+        for future in pending.values():
+            future.cancel()
+        executor.shutdown(wait=True)
+
+RAW_COLUMNS = ['locality', 'property_type', 'total_price', 'area_sqft', 'price_per_sqft', 'scrape_date', 'listing_url']
+
+def scrape_magicbricks(city=City, property_type='Flats', target_count=500, workers=1,
+                       max_in_flight_per_host=2, max_requests_per_host=None,
+                       requests_per_second=0.5, burst=2, max_retries=4,
+                       cache_dir=None, cache_ttl_hours=24, cache_max_mb=500, replay=False,
+                       resume=True, parser=None, limiter=None, budget=None, log_prefix="",
+                       incremental=False, known_stop_ratio=0.8, metrics=None):
+    """Scrapes one city's listings of one property type and returns the raw CSV path.
+
+    Output goes to ``Data/<city>/<property_type>/<city>_real_estate_raw.csv``.
+    Rows are appended to the CSV after every page and progress is checkpointed
+    alongside it; with ``resume`` an interrupted run continues from the page
+    after the last one written. Pass a shared ``limiter``/``budget`` to run
+    several jobs under one request-rate budget (see crawl_scheduler).
+
+    With ``incremental`` every listing is checked against a persistent
+    ListingIndex and only new or re-priced listings are written, to
+    ``<city>_real_estate_changes.csv`` with ``change_type`` and the previous
+    price and price/sqft.
+    Paging stops at the first page where at least ``known_stop_ratio`` of the
+    listings were already known. Delisted listings are only detected when a
+    run walks every result page, since an early stop cannot tell a delisted
+    listing from one further down the results.
+
+    With ``metrics`` (a PipelineMetrics) the run is recorded as a
+    ``scrape:<city>:<property_type>`` stage.
+    """
+    def log(message):
+        print(f"{log_prefix}{message}")
+
+    stage = metrics.start_stage(f"scrape:{city}:{property_type}") if metrics else None
+
+    output_folder = setup_directories(city, property_type)
+    if incremental:
+        save_path = os.path.join(output_folder, f"{city.lower()}_real_estate_changes.csv")
+        checkpoint = ScrapeCheckpoint(save_path, RAW_COLUMNS + CHANGE_COLUMNS)
+        index = ListingIndex(os.path.join(output_folder, f"{city.lower()}_listing_index.sqlite"))
+    else:
+        save_path = os.path.join(output_folder, f"{city.lower()}_real_estate_raw.csv")
+        checkpoint = ScrapeCheckpoint(save_path, RAW_COLUMNS)
+    if resume and checkpoint.load():
+        log(f"Resuming run from {checkpoint.state['scrape_date']} at page {checkpoint.next_page} "
+            f"({checkpoint.rows} items already saved).")
+    else:
+        checkpoint.start(datetime.now().strftime("%Y-%m-%d"))
+    scrape_date = checkpoint.state['scrape_date']
 
-        except Exception as e:
-            print(f"Error at page {page_number}: {e}")
+    session = requests.Session()
+    budget = budget or HostBudget(max_in_flight_per_host, max_requests_per_host)
+    limiter = limiter or RateLimiter(requests_per_second, burst, max_retries)
+    cache = None
+    if cache_dir or replay:
+        cache = PageCache(cache_dir or os.path.join(project_dir, 'Cache', city),
+                          cache_ttl_hours * 3600, cache_max_mb * 1024 ** 2, replay)
+    if stage:
+        stage.watch_cache("page_cache", cache)
+
+    if replay:
+        log("Replay mode: parsing cached pages only, no network access.")
+    else:
+        log("Initializing session...")
+        try:
+            limiter.get(session, BASE_URL, headers=get_headers(), timeout=15)
+        except: 
+            log("Initial session warm-up failed, continuing anyway...")
+
+    log(f"Starting {city} {property_type} Scrape (Magicbricks) | Target: All listed (up to {target_count}) | Workers: {workers}")
+
+    finished = checkpoint.rows >= target_count
+    pages = iter_listing_pages(session, scrape_date, workers, budget, limiter, cache, checkpoint.next_page,
+                               parser, city, property_type)
+    for page_number, status, records in ([] if finished else pages):
+        if status == "blocked":
+            log(f"IP Blocked (403/429) at page {page_number} after {max_retries} retries.")
+            break
+        if status == "empty":
+            log(f"No listings found on page {page_number}. Ending.")
+            finished = True
+            # Only the end of a crawl that walked every page from page 1 says the
+            # rest are gone; an empty first page is a block, CAPTCHA or selector change
+            walked_all_pages = page_number > 1 and page_number == checkpoint.next_page
+            if incremental and walked_all_pages:
+                delisted = index.mark_delisted(scrape_date)
+                checkpoint.write_page(page_number - 1, delisted)
+                log(f"{len(delisted)} listings delisted since the last full crawl.")
+            elif incremental:
+                log("Not marking delisted listings: this run did not walk the result pages from page 1.")
+            break
+        if status == "miss":
+            log(f"Page {page_number} is not in the cache. Replay complete.")
+            finished = True
+            break
+        if status == "budget":
+            log(f"Request budget exhausted before page {page_number}.")
+            break
+        if status == "error":
+            log(f"Error at page {page_number}: {records}")
             break
 
-    # Final Save
-    if all_data:
-        df = pd.DataFrame(all_data)
-        filename = "nagpur_real_estate_raw.csv" 
-        save_path = os.path.join(output_folder, filename)
-        df.to_csv(save_path, index=False)
-        print(f"\nScraping Complete. Final Count: {len(df)} listings.")
-        print(f"CSV saved to: {save_path}")
-        print("\nDataset Preview:")
-        print(df.head())
-        return df
-    else:
-        print("No data collected. Verify if Magicbricks updated its selectors.")
-        return None
+        page_rows = []
+        page_urls = set()
+        for record in records:
+            # Featured listings repeat across pages
+            if record['listing_url'] in checkpoint.seen_urls or record['listing_url'] in page_urls:
+                continue
+            page_urls.add(record['listing_url'])
+            page_rows.append(record)
+            if checkpoint.rows + len(page_rows) >= target_count: break
+
+        if incremental:
+            changes, known_count = index.observe(page_rows, scrape_date)
+            checkpoint.write_page(page_number, changes)
+            # Unchanged listings are not written but still must not be re-counted
+            checkpoint.seen_urls.update(page_urls)
+            log(f"Page {page_number}: {len(changes)} new/changed, {known_count}/{len(page_rows)} already known.")
+            if page_rows and known_count / len(page_rows) >= known_stop_ratio:
+                log(f"Page {page_number} is mostly known listings. Stopping incremental scrape.")
+                finished = True
+                break
+        else:
+            checkpoint.write_page(page_number, page_rows)
+            log(f"Page {page_number}: Collected {checkpoint.rows} items.")
 
-if __name__ == "__main__":
-    scrape_nagpur_magicbricks(target_count=300)
+        if checkpoint.rows >= target_count:
+            finished = True
+            break
+    pages.close()
+    if incremental:
+        index.close()
 
+    log(f"Rate limiter: {limiter.report()}")
+    if cache:
+        log(f"Page cache: {cache.report()}")
+    if stage:
+        stage.extra["requests"] = dict(limiter.stats)
+        metrics.finish_stage(stage, rows_out=checkpoint.rows)
 
-# In[8]:
+    # Final Save
+    if finished:
+        checkpoint.finish()
+    else:
+        log("Run interrupted; rerun to resume from the checkpoint.")
+    if checkpoint.rows:
+        print()
+        log(f"Scraping {'Complete' if finished else 'Paused'}. Final Count: {checkpoint.rows} listings.")
+        log(f"CSV saved to: {save_path}")
+        print()
+        log("Dataset Preview:")
+        log(pd.read_csv(save_path, nrows=5))
+        return save_path
+    else:
+        log("No data collected. Verify if Magicbricks updated its selectors.")
+        return None
 
+def scrape_nagpur_magicbricks(target_count=500, **kwargs):
+    return scrape_magicbricks(City, 'Flats', target_count, **kwargs)
 
-from IPython.display import FileLink
-FileLink("./Real_estate_Nagpur_MB/Data/Nagpur/Flats/nagpur_real_estate_raw.csv")
+if __name__ == "__main__":
+    from instrumentation import PipelineMetrics
+    metrics = PipelineMetrics("scrape")
+    scrape_nagpur_magicbricks(target_count=300, metrics=metrics)
+    metrics.write_prometheus()
 
 
 # In[ ]:
@@ -0,0 +1,98 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+
+
+class PageCache:
+    """On-disk cache of fetched HTML, keyed by a SHA-256 of the page URL.
+
+    Bodies are stored gzip-compressed as ``<key><suffix>``. A file's mtime is
+    when the page was fetched (used for the TTL) and its atime is when it was
+    last read (used for LRU eviction once the cache exceeds ``max_bytes``).
+    In ``replay`` mode entries never expire and callers must not hit the
+    network on a miss.
+    """
+
+    def __init__(self, cache_dir, ttl_seconds=24 * 3600, max_bytes=500 * 1024 ** 2, replay=False,
+                 suffix=".html.gz"):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.replay = replay
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(os.path.getsize(p) for p in self._entries())
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, self.key(url) + self.suffix)
+
+    def _entries(self):
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                if name.endswith(self.suffix)]
+
+    def get(self, url):
+        path = self._path(url)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+
+        now = time.time()
+        if not self.replay and now - stat.st_mtime > self.ttl_seconds:
+            self._count(hit=False)
+            return None
+
+        try:
+            with gzip.open(path, "rb") as f:
+                body = f.read()
+        except (OSError, EOFError):
+            # Truncated write from a killed run
+            self._count(hit=False)
+            return None
+        os.utime(path, (now, stat.st_mtime))
+        self._count(hit=True)
+        return body
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def put(self, url, body):
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(body)
+        with self._lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._total_bytes += os.path.getsize(path) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Least recently read first
+        entries = sorted(self._entries(), key=lambda p: os.stat(p).st_atime)
+        for path in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            size = os.path.getsize(path)
+            os.remove(path)
+            self._total_bytes -= size
+
+    def report(self):
+        total = self.hits + self.misses
+        hit_rate = self.hits / total * 100 if total else 0
+        return f"{self.hits} hits, {self.misses} misses ({hit_rate:.0f}% hit rate), {self._total_bytes / 1024 ** 2:.1f} MB on disk"
@@ -0,0 +1,306 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+
+from storage import stage_path
+from timeseries_store import TIMESERIES_PATH
+
+
+# Runs the exported notebooks as one DAG:
+#
+#   scrape -> clean -> forecast
+#                  \-> explore (optional)
+#                  \-> eda (optional)
+#                  \-> backtest (optional)
+#
+# Each stage declares the files it reads and writes; a stage depends on the
+# stages that write its inputs. A stage is skipped when the content hash of
+# its inputs (data and code) matches the last successful run and its outputs
+# are still as that run left them. Stages whose dependencies are done run
+# concurrently.
+#
+#   python pipeline.py                    # nightly: scrape, then whatever the new data requires
+#   python pipeline.py --from clean       # skip scraping
+#   python pipeline.py --force forecast   # rerun a stage even if unchanged
+#   python pipeline.py --stages explore   # optional stages run only when named
+#   python pipeline.py --dry-run
+
+STATE_FILE = os.environ.get("NAGPUR_RE_PIPELINE_STATE", ".pipeline_state.json")
+
+# Every script reads and writes paths relative to the project directory
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+RAW_CSV = "nagpur_real_estate_raw.csv"
+
+
+class Stage:
+    """One pipeline step: a script run in its own interpreter, or a function.
+
+    ``inputs``/``outputs`` are files or directories; ``tokens`` are extra
+    strings folded into the input hash (e.g. the date, so a scrape runs once a
+    day). Optional stages only run when asked for by name.
+    """
+
+    def __init__(self, name, inputs=(), outputs=(), script=None, func=None, tokens=(), optional=False):
+        self.name = name
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.script = script
+        self.func = func
+        self.tokens = list(tokens)
+        self.optional = optional
+
+    def run(self):
+        if self.func is not None:
+            self.func()
+            return
+        result = subprocess.run([sys.executable, self.script], capture_output=True, text=True, cwd=PROJECT_DIR)
+        if result.returncode != 0:
+            raise RuntimeError(f"{self.script} exited with {result.returncode}:\n{result.stderr[-3000:]}")
+
+
+def _scrape():
+    from checkpoint import ScrapeCheckpoint
+    from nagpur_data_scraping import RAW_COLUMNS, scrape_nagpur_magicbricks
+    from instrumentation import PipelineMetrics
+
+    metrics = PipelineMetrics("scrape")
+    raw_path = scrape_nagpur_magicbricks(target_count=300, metrics=metrics)
+    metrics.write_prometheus()
+    if raw_path is None:
+        raise RuntimeError("The scrape collected no listings")
+    if not ScrapeCheckpoint(raw_path, RAW_COLUMNS).completed():
+        # A blocked or budget-limited run leaves a partial CSV; cleaning it would publish a partial dataset
+        raise RuntimeError(f"The scrape stopped before completing; rerun to resume from the checkpoint of {raw_path}")
+    # The cleaning notebook reads the raw CSV from the working directory
+    shutil.copyfile(raw_path, RAW_CSV)
+
+
+SCRAPE_CODE = ["nagpur_data_scraping.py", "card_parser.py", "rate_limiter.py", "page_cache.py", "checkpoint.py",
+               "listing_index.py", "instrumentation.py"]
+FORECAST_CODE = ["prophet_app.py", "batch_forecast.py", "baseline_forecast.py", "model_store.py",
+                 "forecast_cache.py", "page_cache.py", "locality_index.py", "storage.py", "timeseries_store.py",
+                 "uncertainty.py", "instrumentation.py"]
+
+
+def build_stages():
+    cleaned_store = stage_path("cleaned")
+    return [
+        Stage("scrape", outputs=[RAW_CSV], func=_scrape,
+              inputs=SCRAPE_CODE,
+              tokens=[date.today().isoformat()]),
+        Stage("clean", script="nagpur_real_estate_cleaned.py",
+              inputs=[RAW_CSV, "nagpur_real_estate_cleaned.py", "cleaning.py", "storage.py", "timeseries_store.py",
+                      "instrumentation.py"],
+              outputs=["nagpur_real_estate_cleaned.csv", cleaned_store, TIMESERIES_PATH]),
+        Stage("forecast", script="prophet_app.py",
+              inputs=[cleaned_store, TIMESERIES_PATH] + FORECAST_CODE,
+              outputs=["forecast_summary.csv", "locality_stats.csv",
+                       stage_path("forecast_summary"), stage_path("locality_stats")]),
+        Stage("explore", script="forecasting.py", optional=True,
+              inputs=[cleaned_store, TIMESERIES_PATH, "forecasting.py"]),
+        Stage("eda", script="nagpur_real_estate_eda.py", optional=True,
+              inputs=["nagpur_real_estate_cleaned.csv", "nagpur_real_estate_eda.py"]),
+        Stage("backtest", script="backtest.py", optional=True,
+              inputs=[cleaned_store, TIMESERIES_PATH, "backtest.py"] + FORECAST_CODE,
+              outputs=["backtest_results.csv"]),
+    ]
+
+
+def _inside(path, parent):
+    path, parent = os.path.normpath(path), os.path.normpath(parent)
+    return path == parent or path.startswith(parent + os.sep)
+
+
+def dependencies(stages):
+    """stage name -> names of the stages that write any of its inputs."""
+    return {
+        stage.name: {other.name for other in stages if other is not stage
+                     and any(_inside(i, o) or _inside(o, i) for i in stage.inputs for o in other.outputs)}
+        for stage in stages
+    }
+
+
+class ContentHasher:
+    """SHA-256 of files and directory trees, memoized by (size, mtime) across runs.
+
+    SQLite databases are hashed by their rows, since an upsert of identical
+    rows still changes the file's bytes (its change counter).
+    """
+
+    def __init__(self, memo=None):
+        self.memo = memo or {}
+
+    def file(self, path):
+        stat = os.stat(path)
+        key = f"{stat.st_size}:{stat.st_mtime_ns}"
+        cached = self.memo.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        digest = hashlib.sha256()
+        if path.endswith(".sqlite"):
+            conn = sqlite3.connect(path)
+            for statement in conn.iterdump():
+                digest.update(statement.encode("utf-8"))
+            conn.close()
+        else:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        self.memo[path] = (key, digest.hexdigest())
+        return digest.hexdigest()
+
+    def path(self, path):
+        if os.path.isfile(path):
+            return self.file(path)
+        if not os.path.isdir(path):
+            return "missing"
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full = os.path.join(root, name)
+                digest.update(os.path.relpath(full, path).encode("utf-8"))
+                digest.update(self.file(full).encode("ascii"))
+        return digest.hexdigest()
+
+    def paths(self, paths, tokens=()):
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(f"{path}={self.path(path)}\n".encode("utf-8"))
+        for token in tokens:
+            digest.update(f"token={token}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+
+def load_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return {"stages": {}, "hashes": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_FILE):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_pipeline(stages, selected=None, force=(), jobs=2, dry_run=False, state_path=STATE_FILE):
+    """Runs the selected stages in dependency order, skipping unchanged ones.
+
+    ``selected`` defaults to every non-optional stage. A stage's unselected
+    dependencies are treated as done. Returns ``{stage: status}`` with status
+    ran, skipped, failed or blocked (a dependency failed); with ``dry_run``,
+    would run instead of ran, for a stage and everything downstream of it.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    selected = set(selected or [s.name for s in stages if not s.optional])
+    deps = {name: d & selected for name, d in dependencies(stages).items() if name in selected}
+
+    state = load_state(state_path)
+    hasher = ContentHasher({path: tuple(v) for path, v in state.get("hashes", {}).items()})
+    status = {}
+
+    def should_run(stage):
+        if stage.name in force:
+            return True
+        previous = state["stages"].get(stage.name)
+        if not previous:
+            return True
+        # Hashed when the stage is about to start, after its dependencies have written
+        if previous["inputs"] != hasher.paths(stage.inputs, stage.tokens):
+            return True
+        return bool(stage.outputs) and previous["outputs"] != hasher.paths(stage.outputs)
+
+    def execute(stage):
+        # A dependency that would run would change this stage's inputs too
+        if dry_run and any(status.get(d) == "would run" for d in deps[stage.name]):
+            return "would run", 0.0
+        if not should_run(stage):
+            return "skipped", 0.0
+        if dry_run:
+            return "would run", 0.0
+        start = time.perf_counter()
+        stage.run()
+        return "ran", time.perf_counter() - start
+
+    pending = dict(deps)
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending or running:
+            for name, needs in list(pending.items()):
+                if any(status.get(d) in ("failed", "blocked") for d in needs):
+                    status[name] = "blocked"
+                    print(f"[pipeline] {name}: blocked by a failed dependency")
+                    del pending[name]
+                elif all(d in status for d in needs):
+                    print(f"[pipeline] {name}: starting")
+                    running[executor.submit(execute, by_name[name])] = name
+                    del pending[name]
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                stage = by_name[name]
+                try:
+                    status[name], seconds = future.result()
+                except Exception as e:
+                    status[name] = "failed"
+                    print(f"[pipeline] {name}: failed\n{e}")
+                    continue
+                print(f"[pipeline] {name}: {status[name]}" + (f" in {seconds:.1f}s" if status[name] == "ran" else ""))
+                if status[name] == "ran":
+                    state["stages"][name] = {
+                        "inputs": hasher.paths(stage.inputs, stage.tokens),
+                        "outputs": hasher.paths(stage.outputs),
+                        "finished": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    }
+                    state["hashes"] = hasher.memo
+                    save_state(state, state_path)
+    return status
+
+
+def main():
+    stages = build_stages()
+    names = [stage.name for stage in stages]
+    parser = argparse.ArgumentParser(description="Run the scrape -> clean -> forecast pipeline, skipping unchanged stages.")
+    parser.add_argument("--stages", nargs="+", choices=names, help="run only these stages (and allow optional ones)")
+    parser.add_argument("--from", dest="start", choices=names, help="run this stage and everything downstream of it")
+    parser.add_argument("--force", nargs="*", default=[], choices=names, help="rerun these stages even if unchanged")
+    parser.add_argument("--jobs", type=int, default=2, help="stages to run at once")
+    parser.add_argument("--dry-run", action="store_true", help="report what would run")
+    args = parser.parse_args()
+
+    # Input hashes, the state file and function stages resolve paths the way the scripts do
+    os.chdir(PROJECT_DIR)
+    selected = args.stages
+    if args.start:
+        deps = dependencies(stages)
+        downstream = {args.start}
+        changed = True
+        while changed:
+            changed = False
+            for stage in stages:
+                if not stage.optional and stage.name not in downstream and deps[stage.name] & downstream:
+                    downstream.add(stage.name)
+                    changed = True
+        selected = [name for name in names if name in downstream]
+
+    status = run_pipeline(stages, selected, set(args.force), args.jobs, args.dry_run)
+    print("[pipeline] " + ", ".join(f"{name}: {s}" for name, s in status.items()))
+    return 1 if any(s in ("failed", "blocked") for s in status.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
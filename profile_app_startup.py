@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+
+# Cold-start check for the Streamlit app: time to first render of each page in
+# a fresh interpreter, and which heavy modules the non-forecasting pages pull
+# in. Exits non-zero when a page is over budget or imports a forecasting
+# dependency it should not.
+#
+#   python profile_app_startup.py                  # run from the directory with the data
+#   python profile_app_startup.py --budget 2.5 --json startup_profile.json
+
+HEAVY_MODULES = ["prophet", "cmdstanpy", "stanio"]
+# Pages that must render without the forecasting stack
+LIGHT_PAGES = ["Dashboard", "Compare Localities", "Download Data"]
+# Seconds allowed to first render, per light page; tests/test_app_startup.py enforces it
+FIRST_RENDER_BUDGET = 3.0
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+RENDER_PAGE = r"""
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=300)
+page = {page!r}
+if page != "Dashboard":
+    # The sidebar radio exists only after a first run; time both runs
+    at.run()
+    at.sidebar.radio[0].set_value(page)
+at.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "errors": [str(e.value) for e in at.exception],
+    "heavy_modules": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def render_page(page, app_path):
+    """Renders one page in a fresh interpreter with the background preload off."""
+    env = dict(os.environ, NAGPUR_RE_PRELOAD_FORECASTING="0",
+               PYTHONPATH=os.pathsep.join(filter(None, [APP_DIR, os.environ.get("PYTHONPATH")])))
+    code = RENDER_PAGE.format(app=app_path, page=page, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+    if result.returncode != 0 or not lines:
+        return {"seconds": None, "errors": [result.stderr.strip()[-2000:]], "heavy_modules": []}
+    return json.loads(lines[-1])
+
+
+def import_profile(module="app_pages.data", top=10):
+    """Slowest imports (cumulative microseconds) behind ``module``, from ``python -X importtime``."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [APP_DIR, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=env)
+    rows = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", line)
+        if match:
+            rows.append((int(match.group(2)), match.group(4).strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the Streamlit app's cold-start render times.")
+    parser.add_argument("--app", default=os.path.join(APP_DIR, "app.py"))
+    parser.add_argument("--budget", type=float, default=FIRST_RENDER_BUDGET, help="seconds allowed to first render, per light page")
+    parser.add_argument("--json", default=None, help="also write the results here")
+    args = parser.parse_args()
+
+    print("Slowest imports behind the app's startup modules:")
+    for micros, module in import_profile():
+        print(f"  {micros / 1000:8.1f} ms  {module}")
+
+    results = {}
+    failures = []
+    for page in LIGHT_PAGES + ["Trend & Forecast"]:
+        result = results[page] = render_page(page, args.app)
+        seconds = result["seconds"]
+        print(f"{page:<20} {'failed' if seconds is None else f'{seconds:.2f}s'}"
+              f"  heavy modules: {', '.join(result['heavy_modules']) or 'none'}")
+        if result["errors"]:
+            failures.append(f"{page}: {result['errors']}")
+        if page in LIGHT_PAGES:
+            if seconds is not None and seconds > args.budget:
+                failures.append(f"{page}: {seconds:.2f}s to first render, budget {args.budget:.2f}s")
+            if result["heavy_modules"]:
+                failures.append(f"{page}: imported {', '.join(result['heavy_modules'])}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"budget_seconds": args.budget, "pages": results}, f, indent=2)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print("Startup profile OK." if not failures else f"{len(failures)} startup checks failed.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
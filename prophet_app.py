@@ -4,114 +4,103 @@
 # In[32]:
 
 
-from prophet import Prophet
 import pandas as pd
 import numpy as np
 
-
-def create_simulated_timeseries(df_locality, days=120):
-    current_price = df_locality["avg_price_per_sqft"].mean()
-
-    if pd.isna(current_price) or current_price <= 0:
-        return None
-
-    dates = pd.date_range(end=pd.Timestamp.today(), periods=days)
-
-    trend = np.linspace(0, current_price * 0.05, days)
-    noise = np.random.normal(0, current_price * 0.02, days)
-
-    prices = current_price + trend + noise
-
-    return pd.DataFrame({"ds": dates, "y": prices})
-
-
-def calculate_growth(current_price, forecast_price):
-    if pd.isna(current_price) or current_price <= 0:
-        return 0
-    return ((forecast_price - current_price) / current_price) * 100
-
-
-forecast_summaries = []
-
-for loc in df["locality"].unique():
-
-    df_loc = df[df["locality"] == loc]
-
-    ts_data = create_simulated_timeseries(df_loc)
-
-    if ts_data is None or len(ts_data) < 5:
-        continue
-
-    model = Prophet()
-    model.fit(ts_data)
-
-    future = model.make_future_dataframe(periods=90)
-    forecast = model.predict(future)
-
-    current_price = ts_data["y"].iloc[-1]
-    forecast_price = forecast["yhat"].iloc[-1]
-
-    growth = calculate_growth(current_price, forecast_price)
-
-    forecast_summaries.append({
-        "locality": loc,
-        "current_price": round(current_price, 2),
-        "forecast_price": round(forecast_price, 2),
-        "%_growth": round(growth, 2),
-        "trend": "Upward" if growth > 0 else "Downward"
-    })
-
-
-forecast_summary_df = pd.DataFrame(forecast_summaries)
-
-
-if len(forecast_summary_df) == 0:
-    print("No forecasts generated. Check data.")
-else:
-    forecast_summary_df = forecast_summary_df.sort_values(
-        by="%_growth", ascending=False
-    ).reset_index(drop=True)
-
-forecast_summary_df.head()
-
-
-
-
-
-compare_stats = (
-    df.groupby("locality")
-    .agg(
-        avg_price_sqft=("avg_price_per_sqft", "mean"),
-        median_price=("median_price", "median"),
-        listings=("locality", "count")
+from baseline_forecast import baseline_forecasts, flag_for_prophet
+from batch_forecast import run_batch_forecasts
+from forecast_cache import ForecastCache
+from locality_index import LocalityIndex
+from instrumentation import PipelineMetrics
+from model_store import MODEL_DIR
+from storage import read_stage, write_stage
+from timeseries_store import TimeSeriesStore
+from uncertainty import UncertaintyConfig
+
+
+# "prophet": Prophet for every locality
+# "baseline": vectorized trend model for every locality (BASELINE_METHOD: ols, holt, damped)
+# "screen": baseline first, then Prophet only for the localities it flags
+FORECAST_ENGINE = "prophet"
+BASELINE_METHOD = "ols"
+
+# Forecast bands: Prophet's own sampling, or UncertaintyConfig("bootstrap",
+# samples=..., quantiles=(lo, hi)) to fit without it and bootstrap every
+# locality's band in one batch. Defaults to NAGPUR_RE_UNCERTAINTY so the app
+# finds the cached trajectories.
+UNCERTAINTY = UncertaintyConfig()
+
+SUMMARY_COLUMNS = ["locality", "current_price", "forecast_price", "%_growth", "trend"]
+
+
+def main():
+    # Latest locality summary written by the cleaning notebook
+    df = read_stage("cleaned", latest=True)
+
+    # Scraped price history per locality; localities with too few scrape dates
+    # fall back to the simulated series
+    timeseries = TimeSeriesStore()
+
+    if FORECAST_ENGINE == "prophet":
+        prophet_localities = df["locality"]
+    else:
+        baseline_df = baseline_forecasts(df, method=BASELINE_METHOD, periods=90, store=timeseries)
+        prophet_localities = flag_for_prophet(baseline_df) if FORECAST_ENGINE == "screen" else []
+        print(f"Baseline ({BASELINE_METHOD}) flagged {len(prophet_localities)}/{len(baseline_df)} localities for Prophet.")
+
+    # Listings sorted by locality, so picking the flagged localities is slicing, not a scan
+    listings_by_locality = LocalityIndex(df)
+    prophet_df = df if FORECAST_ENGINE == "prophet" else listings_by_locality.take(prophet_localities)
+
+    # One Prophet fit per locality, spread over all cores; set workers to limit it.
+    # Trajectories go to the forecast cache so the app can serve them without refitting;
+    # fitted models go to MODEL_DIR so tomorrow's refit starts from today's parameters.
+    metrics = PipelineMetrics("forecast")
+    forecast_cache = ForecastCache()
+    with metrics.stage("forecast", rows_in=prophet_df["locality"].nunique()) as forecast_stage:
+        forecast_stage.watch_cache("forecast_cache", forecast_cache)
+        forecast_summaries, failed_localities = run_batch_forecasts(
+            prophet_df, workers=None, periods=90, cache=forecast_cache,
+            model_dir=MODEL_DIR, store=timeseries, metrics=metrics, uncertainty=UNCERTAINTY
+        )
+        forecast_stage.rows_out = len(forecast_summaries)
+    print("Slowest fits:", metrics.slowest_fits(5))
+
+    forecast_summary_df = pd.DataFrame(forecast_summaries, columns=SUMMARY_COLUMNS)
+    if FORECAST_ENGINE != "prophet":
+        baseline_rows = baseline_df[~baseline_df["locality"].isin(forecast_summary_df["locality"])]
+        forecast_summary_df = pd.concat([forecast_summary_df, baseline_rows[SUMMARY_COLUMNS]], ignore_index=True)
+
+    if len(forecast_summary_df) == 0:
+        print("No forecasts generated. Check data.")
+    else:
+        forecast_summary_df = forecast_summary_df.sort_values(
+            by="%_growth", ascending=False
+        ).reset_index(drop=True)
+    print(forecast_summary_df.head())
+
+    compare_stats = (
+        df.groupby("locality")
+        .agg(
+            avg_price_sqft=("avg_price_per_sqft", "mean"),
+            median_price=("median_price", "median"),
+            listings=("locality", "count")
+        )
+        .reset_index()
     )
-    .reset_index()
-)
-
-compare_stats.head()
-
-
-
-forecast_summary_df.to_csv("forecast_summary.csv", index=False)
-
-locality_stats.to_csv("locality_stats.csv", index=False)
-
-
-# In[33]:
-
-
-from IPython.display import FileLink
-FileLink("forecast_summary.csv")  # it gets downloaded as xls file in the device 
-
-
-# In[34]:
-
-
-FileLink("locality_stats.csv")
-
-
-# In[ ]:
+    locality_stats = compare_stats.rename(columns={"listings": "total_listings"})
 
+    forecast_summary_df.to_csv("forecast_summary.csv", index=False)
+    locality_stats.to_csv("locality_stats.csv", index=False)
 
+    with metrics.stage("publish", rows_in=len(forecast_summary_df)) as publish_stage:
+        write_stage(forecast_summary_df, "forecast_summary")
+        write_stage(locality_stats, "locality_stats")
+        publish_stage.rows_out = len(forecast_summary_df)
+    metrics.write_prometheus()
 
 
+# Worker processes re-import this file under the spawn/forkserver start
+# methods; only the parent may run the batch
+if __name__ == "__main__":
+    main()
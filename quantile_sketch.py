@@ -0,0 +1,150 @@
+import math
+from collections import Counter
+
+import numpy as np
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch-style).
+
+    Holds values exactly until there are more than ``exact_limit`` of them, so
+    small groups (most localities) get exact pandas-style quantiles. After
+    that, values fall into logarithmic buckets that are ``relative_accuracy``
+    wide. Any quantile is then within that relative error of the true value,
+    and memory grows with the spread of the values rather than with their
+    count. Counts can be merged and decremented, so values can also be
+    removed.
+    Values <= 0 share a single bucket (prices and areas are positive).
+    """
+
+    def __init__(self, relative_accuracy=0.01, exact_limit=64):
+        self.relative_accuracy = relative_accuracy
+        self.exact_limit = exact_limit
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.values = []
+        self.bins = None
+        self.zero_count = 0
+        self.count = 0
+
+    def _index(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _bin_value(self, index):
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def _add_to_bins(self, value, weight=1):
+        if value <= 0:
+            self.zero_count += weight
+            return
+        index = self._index(value)
+        count = self.bins.get(index, 0) + weight
+        if count:
+            self.bins[index] = count
+        else:
+            del self.bins[index]
+
+    def _spill(self):
+        self.bins = {}
+        for value in self.values:
+            self._add_to_bins(value)
+        self.values = None
+
+    def add(self, value):
+        self.count += 1
+        if self.bins is None:
+            self.values.append(value)
+            if len(self.values) > self.exact_limit:
+                self._spill()
+        else:
+            self._add_to_bins(value)
+
+    def update(self, values):
+        for value in np.asarray(values, dtype=float):
+            self.add(float(value))
+
+    def removable(self, values):
+        """Mask of ``values`` that ``remove`` can take out.
+
+        A value counts only if the sketch holds it (or, once binned, holds
+        something in its bucket) more often than it repeats earlier in
+        ``values``. NaN is never removable.
+        """
+        if self.bins is None:
+            available = Counter(self.values)
+        else:
+            available = Counter(self.bins)
+            available["zero"] = self.zero_count
+        mask = np.zeros(len(values), dtype=bool)
+        for i, value in enumerate(np.asarray(values, dtype=float)):
+            if np.isnan(value):
+                continue
+            key = float(value) if self.bins is None else ("zero" if value <= 0 else self._index(value))
+            if available[key] > 0:
+                available[key] -= 1
+                mask[i] = True
+        return mask
+
+    def remove(self, value):
+        """Removes one occurrence of ``value``; assumes it was added before."""
+        self.count -= 1
+        if self.bins is None:
+            self.values.remove(value)
+        else:
+            self._add_to_bins(value, -1)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.bins is None and other.bins is None and len(self.values) + len(other.values) <= self.exact_limit:
+            self.values.extend(other.values)
+        else:
+            if self.bins is None:
+                self._spill()
+            if other.bins is None:
+                for value in other.values:
+                    self._add_to_bins(value)
+            else:
+                for index, count in other.bins.items():
+                    self.bins[index] = self.bins.get(index, 0) + count
+                self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float("nan")
+        if self.bins is None:
+            return float(np.quantile(self.values, q))
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return self._bin_value(index)
+        return self._bin_value(max(self.bins))
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "exact_limit": self.exact_limit,
+            "values": self.values,
+            "bins": None if self.bins is None else {str(k): v for k, v in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state["relative_accuracy"], state["exact_limit"])
+        sketch.values = state["values"]
+        sketch.bins = None if state["bins"] is None else {int(k): v for k, v in state["bins"].items()}
+        sketch.zero_count = state["zero_count"]
+        sketch.count = state["count"]
+        return sketch
@@ -0,0 +1,150 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+RETRY_STATUSES = {403, 429, 500, 502, 503, 504}
+
+
+class BudgetExhausted(Exception):
+    """The request budget refused a request before any response came back."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, up to ``burst`` banked."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.max_rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """Blocks until a token is available and returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def slow_down(self, factor=0.5, min_rate=None):
+        # Multiplicative decrease when the server pushes back
+        with self._lock:
+            floor = min_rate if min_rate is not None else self.max_rate / 20
+            self.rate = max(floor, self.rate * factor)
+
+    def speed_up(self, step=None):
+        # Additive recovery back towards the configured rate
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + (step or self.max_rate / 10))
+
+
+class RateLimiter:
+    """Paces requests through a token bucket and retries throttled responses.
+
+    Retries 403, 429 and 5xx responses (and connection errors) with exponential
+    backoff plus full jitter, honouring ``Retry-After`` when the server sends
+    one. Time spent waiting and time spent fetching are tallied separately.
+    """
+
+    def __init__(self, rate=0.5, burst=1, max_retries=4, backoff_base=5.0, backoff_cap=120.0):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "wait_seconds": 0.0, "fetch_seconds": 0.0}
+
+    def _record(self, key, value):
+        with self._lock:
+            self.stats[key] += value
+
+    def backoff_delay(self, attempt, response=None):
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def get(self, session, url, budget=None, **kwargs):
+        """``session.get`` with pacing and retries.
+
+        With a ``budget`` (a HostBudget) every attempt is charged to it and
+        holds one of its in-flight slots only while the request runs, not
+        through the backoff sleep. When the budget refuses an attempt the
+        last response is returned, or BudgetExhausted raised if there is
+        none. Returns the last response; raises the last connection error if
+        every attempt failed without one.
+        """
+        response, error = None, None
+        for attempt in range(self.max_retries + 1):
+            self._record("wait_seconds", self.bucket.acquire())
+            slot = budget.acquire(url) if budget else None
+            if budget and slot is None:
+                if response is None:
+                    raise BudgetExhausted(url)
+                return response
+
+            start = time.monotonic()
+            response, error = None, None
+            try:
+                response = session.get(url, **kwargs)
+            except Exception as e:
+                error = e
+            finally:
+                if slot:
+                    slot.release()
+            self._record("fetch_seconds", time.monotonic() - start)
+            self._record("requests", 1)
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                self.bucket.speed_up()
+                return response
+            if attempt == self.max_retries:
+                break
+
+            if response is not None and response.status_code in (403, 429):
+                self.bucket.slow_down()
+            delay = self.backoff_delay(attempt, response)
+            self._record("retries", 1)
+            self._record("wait_seconds", delay)
+            time.sleep(delay)
+
+        if response is None:
+            raise error
+        return response
+
+    def report(self):
+        s = self.stats
+        return (f"{s['requests']} requests, {s['retries']} retries | "
+                f"waiting {s['wait_seconds']:.1f}s, fetching {s['fetch_seconds']:.1f}s | "
+                f"current rate {self.bucket.rate:.2f} req/s")
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
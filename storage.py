@@ -0,0 +1,150 @@
+import argparse
+import os
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # CSV fallback only
+    pa = ds = None
+
+
+STORE_ROOT = os.environ.get("NAGPUR_RE_STORE", "./store")
+
+# Flat files each stage used before the Parquet store; read when a stage has
+# not been written to the store yet.
+LEGACY_FILES = {
+    "raw": ["nagpur_real_estate_raw.csv", "nagpur_real_estate_raw.xls"],
+    "cleaned": ["nagpur_real_estate_cleaned.csv", "nagpur_real_estate_cleaned.xls"],
+    "forecast_summary": ["forecast_summary.csv", "forecast_summary.xls"],
+    "locality_stats": ["locality_stats.csv", "locality_stats.xls"],
+}
+
+
+def stage_path(stage, root=STORE_ROOT):
+    return os.path.join(root, stage)
+
+
+def _partitioning(partition_cols):
+    return ds.partitioning(pa.schema([(col, pa.string()) for col in partition_cols]), flavor="hive")
+
+
+def write_stage(df, stage, root=STORE_ROOT, by_locality=False, scrape_date=None):
+    """Writes a stage's frame as Parquet, partitioned by ``scrape_date`` (and ``locality``).
+
+    Frames without a ``scrape_date`` column are stamped with ``scrape_date``
+    or today. Partitions for the dates being written are replaced, so
+    rerunning a day overwrites that day only.
+    """
+    if ds is None:
+        raise ImportError("The Parquet store needs pyarrow: pip install pyarrow")
+    if "scrape_date" not in df.columns:
+        df = df.assign(scrape_date=scrape_date or datetime.today().date())
+    df = df.assign(scrape_date=df["scrape_date"].astype(str))
+    partition_cols = ["scrape_date"] + (["locality"] if by_locality else [])
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    ds.write_dataset(
+        table, stage_path(stage, root), format="parquet",
+        partitioning=_partitioning(partition_cols),
+        existing_data_behavior="delete_matching",
+    )
+    return stage_path(stage, root)
+
+
+def _dataset(stage, root):
+    path = stage_path(stage, root)
+    if ds is None or not os.path.isdir(path):
+        return None
+    by_locality = any(name.startswith("locality=")
+                      for date_dir in os.listdir(path) if os.path.isdir(os.path.join(path, date_dir))
+                      for name in os.listdir(os.path.join(path, date_dir)))
+    return ds.dataset(path, format="parquet",
+                      partitioning=_partitioning(["scrape_date"] + (["locality"] if by_locality else [])))
+
+
+def stage_dates(stage, root=STORE_ROOT):
+    """Sorted ``scrape_date`` partitions of a stage, read from directory names only."""
+    path = stage_path(stage, root)
+    if not os.path.isdir(path):
+        return []
+    return sorted(name.split("=", 1)[1] for name in os.listdir(path) if name.startswith("scrape_date="))
+
+
+def read_stage(stage, columns=None, dates=None, localities=None, latest=False, root=STORE_ROOT):
+    """Reads a stage with column projection and partition/row filters pushed down.
+
+    ``dates`` and ``localities`` restrict the rows; ``latest`` keeps only the
+    newest ``scrape_date``. Falls back to the stage's legacy CSV (filtered in
+    pandas) when the store has no data for it.
+    """
+    dataset = _dataset(stage, root)
+    if latest:
+        available = stage_dates(stage, root)
+        dates = available[-1:] if available else dates
+
+    if dataset is None:
+        return _read_legacy(stage, columns, dates, localities, latest)
+
+    expression = None
+    if dates is not None:
+        expression = ds.field("scrape_date").isin([str(d) for d in dates])
+    if localities is not None:
+        locality_filter = ds.field("locality").isin(list(localities))
+        expression = locality_filter if expression is None else expression & locality_filter
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def _read_legacy(stage, columns, dates, localities, latest):
+    for name in LEGACY_FILES[stage]:
+        if os.path.exists(name):
+            break
+    else:
+        raise FileNotFoundError(f"No data for stage {stage!r}: run the pipeline or storage.py import")
+
+    header = pd.read_csv(name, nrows=0).columns
+    filter_dates = "scrape_date" in header and (dates is not None or latest)
+    filter_localities = "locality" in header and localities is not None
+    usecols = None
+    if columns is not None:
+        needed = set(columns)
+        if filter_dates:
+            needed.add("scrape_date")
+        if filter_localities:
+            needed.add("locality")
+        usecols = [c for c in header if c in needed]
+    df = pd.read_csv(name, usecols=usecols)
+
+    if filter_dates:
+        if dates is None:
+            dates = [df["scrape_date"].max()]
+        df = df[df["scrape_date"].astype(str).isin([str(d) for d in dates])]
+    if filter_localities:
+        df = df[df["locality"].isin(list(localities))]
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df.reset_index(drop=True)
+
+
+def import_legacy(root=STORE_ROOT):
+    """Copies every stage's legacy CSV into the Parquet store."""
+    for stage, names in LEGACY_FILES.items():
+        for name in names:
+            if os.path.exists(name):
+                write_stage(pd.read_csv(name), stage, root)
+                print(f"{name} -> {stage_path(stage, root)}")
+                break
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parquet store for the pipeline stages.")
+    parser.add_argument("command", choices=["import", "dates"])
+    parser.add_argument("--stage", default="cleaned")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        import_legacy()
+    else:
+        print("\n".join(stage_dates(args.stage)))
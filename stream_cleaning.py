@@ -0,0 +1,104 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from cleaning import clean_deduplicated, url_column as find_url_column
+from locality_summary import LocalitySummaryState
+
+
+DEDUP_COLUMNS = ["total_price", "locality", "area_sqft"]
+
+
+class HashSet:
+    """Set of 64-bit row hashes kept as one sorted uint64 array (8 bytes per key)."""
+
+    def __init__(self):
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def first_seen(self, hashes):
+        """Marks hashes that are new both to the set and earlier in ``hashes``, then adds them."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        new = ~pd.Series(hashes).duplicated().to_numpy()
+        if len(self.hashes):
+            pos = np.searchsorted(self.hashes, hashes)
+            pos[pos == len(self.hashes)] = 0
+            new &= self.hashes[pos] != hashes
+        self.hashes = np.union1d(self.hashes, hashes[new])
+        return new
+
+
+def _row_hashes(df, columns):
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+
+def clean_raw_csv(raw_path, chunksize=100_000, url_column=None, cleaned_path=None, scrape_date=None, metrics=None):
+    """Streams a raw listings CSV through the cleaning steps chunk by chunk.
+
+    Does what nagpur_real_estate_cleaned.py does with the whole file loaded:
+    drop repeated URLs, drop repeated (total_price, locality, area_sqft)
+    rows, drop rows missing price or locality, clean, filter price/sqft.
+    Duplicates are found across chunks through 64-bit row hashes, so rows are
+    never kept in memory beyond one chunk. The dedup columns are read as text
+    so a key hashes the same in every chunk whatever dtype pandas would infer
+    for that chunk. URLs are read from ``url_column``, by default whichever of
+    ``listing_url`` (the scraper's) and ``url`` the file has.
+
+    Cleaned rows are appended to ``cleaned_path`` if given. Returns the
+    ``locality_summary`` frame, built from running aggregates (see
+    LocalitySummaryState for median accuracy). With ``metrics`` (a
+    PipelineMetrics) the run is recorded as the ``clean`` stage.
+    """
+    stage = metrics.start_stage("clean") if metrics else None
+    header = pd.read_csv(raw_path, nrows=0).columns
+    url_column = url_column or find_url_column(header)
+    has_url = url_column in header
+    text_columns = [c for c in DEDUP_COLUMNS + ([url_column] if has_url else []) if c in header]
+
+    seen_urls, seen_keys = HashSet(), HashSet()
+    state = LocalitySummaryState()
+    if cleaned_path and os.path.exists(cleaned_path):
+        os.remove(cleaned_path)
+
+    rows_in = rows_out = 0
+    for chunk in pd.read_csv(raw_path, chunksize=chunksize, dtype={c: str for c in text_columns}):
+        rows_in += len(chunk)
+        if has_url:
+            chunk = chunk[seen_urls.first_seen(_row_hashes(chunk, [url_column]))]
+        chunk = chunk[seen_keys.first_seen(_row_hashes(chunk, DEDUP_COLUMNS))]
+        chunk = clean_deduplicated(chunk)
+
+        state.add(chunk)
+        rows_out += len(chunk)
+        if cleaned_path:
+            chunk.to_csv(cleaned_path, mode="a", header=not os.path.exists(cleaned_path), index=False)
+
+    print(f"Cleaned {rows_in} raw rows -> {rows_out} listings in {len(state.counts)} localities.")
+    if stage:
+        stage.rows_in = rows_in
+        metrics.finish_stage(stage, rows_out=rows_out)
+    return state.to_frame(scrape_date)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean a raw listings CSV in bounded memory.")
+    parser.add_argument("raw_csv", nargs="?", default="nagpur_real_estate_raw.csv")
+    parser.add_argument("--out", default="nagpur_real_estate_cleaned.csv")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--cleaned-rows", default=None, help="also write the cleaned listing rows here")
+    parser.add_argument("--metrics", action="store_true", help="log stage metrics (see instrumentation.py)")
+    args = parser.parse_args()
+
+    metrics = None
+    if args.metrics:
+        from instrumentation import PipelineMetrics
+        metrics = PipelineMetrics("stream_cleaning")
+    locality_summary = clean_raw_csv(args.raw_csv, args.chunksize, cleaned_path=args.cleaned_rows, metrics=metrics)
+    locality_summary.to_csv(args.out, index=False)
+    print(f"Saved {args.out}")
+    if metrics:
+        metrics.write_prometheus()
@@ -0,0 +1,56 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# The modules are flat files at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nagpur_data_scraping as scraping  # noqa: E402
+import rate_limiter  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "magicbricks")
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+        self.status_code = 200
+        self.headers = {}
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """Serves ``site.pages[n]`` for result page n (the blocked page past the end) on ``site.day``."""
+    import requests
+
+    class Site:
+        pages = {}
+        day = "2026-01-01"
+
+    class FakeSession:
+        def __init__(self):
+            self.cookies = requests.cookies.RequestsCookieJar()
+
+        def get(self, url, headers=None, timeout=None):
+            if "page=" not in url:
+                return FakeResponse(b"")
+            page = int(url.rsplit("=", 1)[1])
+            return FakeResponse(Site.pages.get(page, _read("blocked_no_cards.html")))
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.strptime(Site.day, "%Y-%m-%d")
+
+    monkeypatch.setattr(scraping.requests, "Session", FakeSession)
+    monkeypatch.setattr(scraping, "datetime", FakeDatetime)
+    monkeypatch.setattr(scraping, "project_dir", str(tmp_path))
+    monkeypatch.setattr(rate_limiter.time, "sleep", lambda seconds: None)
+    return Site
@@ -0,0 +1,28 @@
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip("streamlit.testing.v1")
+
+import profile_app_startup as startup  # noqa: E402
+from storage import LEGACY_FILES  # noqa: E402
+
+
+@pytest.fixture
+def app_data(tmp_path, monkeypatch):
+    # The shipped data files, in a scratch directory so the app's store and caches land there
+    for stage in ("cleaned", "forecast_summary", "locality_stats"):
+        shutil.copy(os.path.join(startup.APP_DIR, LEGACY_FILES[stage][-1]), tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.mark.parametrize("page", startup.LIGHT_PAGES)
+def test_light_page_renders_within_budget_without_prophet(app_data, page):
+    result = startup.render_page(page, os.path.join(startup.APP_DIR, "app.py"))
+
+    assert result["errors"] == []
+    assert result["seconds"] <= startup.FIRST_RENDER_BUDGET
+    # sys.modules of the rendering interpreter: prophet and its Stan backend load only for Trend & Forecast
+    assert "prophet" not in result["heavy_modules"]
+    assert result["heavy_modules"] == []
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+from backtest import BacktestSpec, backtest_locality
+
+
+def test_folds_with_empty_horizon_are_skipped():
+    # 60 daily scrapes, a 40-day gap with no scrapes, then 10 more days
+    days = np.r_[np.arange(60), np.arange(100, 110)]
+    ts_data = pd.DataFrame({"ds": pd.Timestamp("2025-01-01") + pd.to_timedelta(days, unit="D"),
+                            "y": 5000 + 3.0 * days})
+    spec = BacktestSpec(horizon=10, period=15, folds=3)
+    assert len(spec.cutoffs(ts_data["ds"])) == 3
+
+    rows = backtest_locality("Dharampeth", ts_data, ["ols", "holt"], spec)
+
+    assert [row["engine"] for row in rows] == ["ols", "holt"]
+    assert all(row["folds"] == 1 and row["points"] == 10 for row in rows)
+    assert all(row["mape"] < 1 for row in rows)
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from card_parser import check_parser_parity, parse_page_bs4, parse_page_lxml
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "magicbricks")
+PAGES = sorted(name for name in os.listdir(FIXTURES) if name.endswith(".html"))
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("name", PAGES)
+def test_backends_return_identical_records(name):
+    city = name.split("_")[0].title()
+    html = _read(name)
+    assert parse_page_lxml(html, "2026-01-01", city) == parse_page_bs4(html, "2026-01-01", city)
+
+
+def test_listing_pages_have_records():
+    records = parse_page_lxml(_read("nagpur_flats_page1.html"), "2026-01-01")
+    assert [r["locality"] for r in records] == ["DHARAMPETH", "CIVIL LINES", "MANISH NAGAR", "WARDHA ROAD", "SADAR"]
+
+
+def test_page_without_cards_is_none_for_both():
+    html = _read("blocked_no_cards.html")
+    assert parse_page_bs4(html, "2026-01-01") is None
+    assert parse_page_lxml(html, "2026-01-01") is None
+
+
+def test_check_parser_parity_over_fixtures():
+    assert check_parser_parity({name: _read(name) for name in PAGES}) == {}
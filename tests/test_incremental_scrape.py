@@ -0,0 +1,42 @@
+import os
+import sqlite3
+
+import nagpur_data_scraping as scraping
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "magicbricks")
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def _scrape():
+    scraping.scrape_magicbricks("Nagpur", "Flats", target_count=100, requests_per_second=1000, incremental=True)
+
+
+def _statuses(tmp_path):
+    conn = sqlite3.connect(os.path.join(tmp_path, "Data", "Nagpur", "Flats", "nagpur_listing_index.sqlite"))
+    rows = dict(conn.execute("SELECT status, COUNT(*) FROM listings GROUP BY status").fetchall())
+    conn.close()
+    return rows
+
+
+def test_empty_first_page_does_not_delist(site, tmp_path):
+    site.pages = {1: _read("nagpur_flats_page1.html")}
+    _scrape()
+    assert _statuses(tmp_path) == {"active": 5}
+
+    # A block or CAPTCHA on page 1 the next day says nothing about the listings
+    site.pages, site.day = {}, "2026-01-02"
+    _scrape()
+    assert _statuses(tmp_path) == {"active": 5}
+
+
+def test_full_crawl_delists_unseen_listings(site, tmp_path):
+    site.pages = {1: _read("nagpur_flats_page1.html")}
+    _scrape()
+
+    site.pages, site.day = {1: _read("pune_houses_page2.html")}, "2026-01-02"
+    _scrape()
+    assert _statuses(tmp_path) == {"active": 3, "delisted": 5}
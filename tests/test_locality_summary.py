@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from cleaning import clean_deduplicated
+from locality_summary import LocalitySummaryState, apply_changes, seed_state
+
+
+def _raw(rows):
+    return pd.DataFrame(rows, columns=["locality", "property_type", "total_price", "area_sqft",
+                                       "price_per_sqft", "scrape_date", "listing_url"])
+
+
+def _listing(url, locality, price, area=1000):
+    return [locality, "Flat", price, area, price / area, "2026-01-01", url]
+
+
+def _changes(rows):
+    df = _raw([row[:7] for row in rows])
+    df["change_type"] = [row[7] for row in rows]
+    df["previous_price"] = [row[8] for row in rows]
+    df["previous_price_per_sqft"] = [row[9] for row in rows]
+    return df
+
+
+SEED = _raw([_listing(f"u{i}", "Dharampeth", 4_000_000 + 100_000 * i) for i in range(5)]
+            + [_listing(f"v{i}", "Sadar", 3_000_000 + 50_000 * i) for i in range(3)])
+
+
+def _delisted(url, locality, price, area=1000):
+    return [locality, "Flat", None, area, price / area, "2026-01-02", url, "delisted", price, price / area]
+
+
+@pytest.mark.parametrize("exact_limit", [64, 2])
+def test_removing_uncounted_listing_is_skipped(exact_limit):
+    # exact_limit=2 puts the Dharampeth sketch in bins, where a bad removal used to go negative
+    state = LocalitySummaryState(exact_limit=exact_limit)
+    state.add(clean_deduplicated(SEED))
+    before = state.to_frame("x")
+
+    # Tracked by the ListingIndex before the state was seeded, at a price the state never saw
+    rows = apply_changes(state, _changes([_delisted("old1", "Dharampeth", 7_777_000)]))
+
+    assert rows == 0
+    pd.testing.assert_frame_equal(state.to_frame("x"), before)
+    assert all(count >= 0 for count in state.counts.values())
+    assert all(sketch.count >= 0 for sketch in state.sketches.values())
+
+
+def test_uncounted_listing_at_a_counted_price_is_skipped():
+    state = seed_state(SEED)
+    before = state.to_frame("x")
+
+    # Same locality and price as the counted u2, but a URL the state never saw
+    rows = apply_changes(state, _changes([_delisted("old2", "Dharampeth", 4_200_000)]))
+
+    assert rows == 0
+    pd.testing.assert_frame_equal(state.to_frame("x"), before)
+    assert "u2" in state.urls
+
+
+def test_removal_matches_rebuild():
+    state = seed_state(SEED)
+    apply_changes(state, _changes([
+        _delisted("u1", "Dharampeth", 4_100_000),
+        _delisted("old1", "Sadar", 9_000_000),
+        ["Sadar", "Flat", 3_500_000, 1000, 3500, "2026-01-02", "v0", "changed", 3_000_000, 3000],
+    ]))
+    current = SEED[SEED["listing_url"] != "u1"].copy()
+    current.loc[current["listing_url"] == "v0", ["total_price", "price_per_sqft"]] = [3_500_000, 3500]
+    pd.testing.assert_frame_equal(state.to_frame("x"), seed_state(current).to_frame("x"))
@@ -0,0 +1,52 @@
+import json
+import os
+
+import pytest
+
+import pipeline
+from pipeline import Stage, run_pipeline
+
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def stages(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write("source.txt", "v1")
+
+    def copy(src, dst):
+        with open(src) as f:
+            _write(dst, f.read())
+
+    return [
+        Stage("first", inputs=["source.txt"], outputs=["middle.txt"], func=lambda: copy("source.txt", "middle.txt")),
+        Stage("second", inputs=["middle.txt"], outputs=["final.txt"], func=lambda: copy("middle.txt", "final.txt")),
+    ]
+
+
+def test_dry_run_reports_dependents_of_changed_stages(stages, tmp_path):
+    state_path = str(tmp_path / "state.json")
+    assert run_pipeline(stages, state_path=state_path) == {"first": "ran", "second": "ran"}
+    assert run_pipeline(stages, dry_run=True, state_path=state_path) == {"first": "skipped", "second": "skipped"}
+
+    _write("source.txt", "v2")
+    assert run_pipeline(stages, dry_run=True, state_path=state_path) == {"first": "would run", "second": "would run"}
+
+
+def test_interrupted_scrape_fails_the_stage(tmp_path, monkeypatch):
+    import nagpur_data_scraping as scraping
+
+    monkeypatch.chdir(tmp_path)
+    raw_path = str(tmp_path / "nagpur_real_estate_raw_partial.csv")
+    _write(raw_path, "locality\nDharampeth\n")
+    _write(str(tmp_path / "nagpur_real_estate_raw_partial.checkpoint.json"), json.dumps({"complete": False}))
+    monkeypatch.setattr(scraping, "scrape_nagpur_magicbricks", lambda **kwargs: raw_path)
+
+    state_path = str(tmp_path / "state.json")
+    scrape = Stage("scrape", outputs=[pipeline.RAW_CSV], func=pipeline._scrape)
+    assert run_pipeline([scrape], state_path=state_path) == {"scrape": "failed"}
+    assert not os.path.exists(pipeline.RAW_CSV)
+    assert not os.path.exists(state_path)
@@ -0,0 +1,59 @@
+import pytest
+
+import rate_limiter
+from nagpur_data_scraping import HostBudget
+from rate_limiter import BudgetExhausted, RateLimiter
+
+URL = "https://www.magicbricks.com/property-for-sale?page=1"
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.statuses.pop(0))
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", slept.append)
+    return slept
+
+
+def test_budget_is_charged_for_every_retry(sleeps):
+    budget = HostBudget(max_in_flight=1)
+    response = RateLimiter(rate=1000, max_retries=4).get(FakeSession([429, 503, 200]), URL, budget=budget)
+
+    assert response.status_code == 200
+    assert budget.requests_issued(URL) == 3
+
+
+def test_slot_is_free_during_backoff(monkeypatch):
+    budget = HostBudget(max_in_flight=1)
+
+    def sleep(seconds):
+        # Another crawl job on the same host can take the only slot while this one backs off
+        slot = budget._slots["www.magicbricks.com"]
+        assert slot.acquire(blocking=False)
+        slot.release()
+
+    monkeypatch.setattr(rate_limiter.time, "sleep", sleep)
+    RateLimiter(rate=1000, max_retries=2).get(FakeSession([429, 200]), URL, budget=budget)
+
+
+def test_exhausted_budget_stops_retries(sleeps):
+    budget = HostBudget(max_requests=2)
+    response = RateLimiter(rate=1000, max_retries=4).get(FakeSession([429, 429, 200]), URL, budget=budget)
+
+    assert response.status_code == 429
+    assert budget.requests_issued(URL) == 2
+    with pytest.raises(BudgetExhausted):
+        RateLimiter(rate=1000).get(FakeSession([200]), URL, budget=budget)
@@ -0,0 +1,24 @@
+import os
+
+import pandas as pd
+
+import nagpur_data_scraping as scraping
+from cleaning import clean_listings
+from stream_cleaning import clean_raw_csv
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "magicbricks")
+
+
+def test_repeated_scraped_urls_are_dropped_across_chunks(site, tmp_path):
+    with open(os.path.join(FIXTURES, "nagpur_flats_page1.html"), "rb") as f:
+        site.pages = {1: f.read()}
+    raw_path = scraping.scrape_magicbricks("Nagpur", "Flats", target_count=100, requests_per_second=1000)
+    scraped = pd.read_csv(raw_path)
+    assert "listing_url" in scraped.columns
+
+    # The same listings scraped again later at new prices, so only their URLs repeat
+    repriced = scraped.assign(total_price=scraped["total_price"].astype(str) + "0")
+    pd.concat([scraped, repriced]).to_csv(raw_path, index=False)
+
+    summary = clean_raw_csv(raw_path, chunksize=2, scrape_date="x")
+    assert summary["total_listings"].sum() == len(clean_listings(scraped))
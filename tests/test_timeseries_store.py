@@ -0,0 +1,75 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import timeseries_store
+from timeseries_store import TimeSeriesStore
+
+
+class OverlapCheckingConnection(sqlite3.Connection):
+    """Records calls that enter the connection while another thread is inside it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.active = 0
+        self.overlaps = 0
+        self.counter_lock = threading.Lock()
+
+    def _enter(self, method, *args):
+        with self.counter_lock:
+            self.active += 1
+            self.overlaps += self.active > 1
+        try:
+            # Widens the window a concurrent call would hit
+            time.sleep(0.001)
+            return method(*args)
+        finally:
+            with self.counter_lock:
+                self.active -= 1
+
+    def execute(self, *args):
+        return self._enter(super().execute, *args)
+
+    def executemany(self, *args):
+        return self._enter(super().executemany, *args)
+
+    def cursor(self, *args):
+        return self._enter(super().cursor, *args)
+
+
+def _summary(day, localities=20):
+    return pd.DataFrame({
+        "locality": [f"LOCALITY {i}" for i in range(localities)],
+        "avg_price_per_sqft": [4000.0 + i + day for i in range(localities)],
+        "median_price": [5_000_000.0] * localities,
+        "total_listings": [10] * localities,
+        "scrape_date": str((pd.Timestamp("2026-01-01") + pd.Timedelta(days=day)).date()),
+    })
+
+
+def test_shared_store_serializes_concurrent_threads(tmp_path, monkeypatch):
+    connect = sqlite3.connect
+    monkeypatch.setattr(timeseries_store.sqlite3, "connect",
+                        lambda *args, **kwargs: connect(*args, factory=OverlapCheckingConnection, **kwargs))
+    # One store shared by every Streamlit script thread, as st.cache_resource holds it
+    store = TimeSeriesStore(str(tmp_path / "timeseries.sqlite"))
+    store.append(_summary(0))
+
+    def session(worker):
+        for day in range(1, 10):
+            if worker == 0:
+                store.append(_summary(day))
+            store.series(f"LOCALITY {worker}")
+            store.localities()
+            store.dates()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(session, range(8)))
+
+    assert store.conn.overlaps == 0
+    assert len(store.dates()) == 10
+    assert len(store.series("LOCALITY 3")) == 10
+    store.close()
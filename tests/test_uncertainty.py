@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from uncertainty import UncertaintyConfig, bootstrap_intervals
+
+
+@pytest.mark.parametrize("engine", ["prophet", "bootstrap"])
+def test_config_rejects_fewer_than_one_sample(engine):
+    with pytest.raises(ValueError):
+        UncertaintyConfig(engine, samples=0)
+
+
+def test_bootstrap_rejects_zero_samples():
+    with pytest.raises(ValueError):
+        bootstrap_intervals([], [], samples=0)
+
+
+def _series(i, points=40):
+    ds = pd.date_range("2025-01-01", periods=points, freq="3D")
+    y = 5000 + 10 * i + np.arange(points) * (1 + i) + np.sin(np.arange(points) * (i + 1)) * 50
+    history = pd.DataFrame({"ds": ds, "y": y})
+    trajectory = pd.DataFrame({"ds": pd.date_range(ds[0], ds[-1] + pd.Timedelta(days=30)),
+                               "yhat": np.linspace(y[0], y[-1] + 30, (ds[-1] - ds[0]).days + 31)})
+    return history, trajectory
+
+
+def test_band_depends_only_on_its_own_seed():
+    histories, trajectories = zip(*(_series(i, points=30 + 5 * i) for i in range(4)))
+    seeds = [11, 22, 33, 44]
+    batch = bootstrap_intervals(histories, trajectories, samples=200, seeds=seeds)
+    split = bootstrap_intervals(histories, trajectories, samples=200, seeds=seeds, batch_elements=1)
+    for i in range(4):
+        alone, = bootstrap_intervals([histories[i]], [trajectories[i]], samples=200, seeds=[seeds[i]])
+        pd.testing.assert_frame_equal(batch[i], alone)
+        pd.testing.assert_frame_equal(split[i], alone)
@@ -0,0 +1,128 @@
+import argparse
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+
+TIMESERIES_PATH = os.environ.get("NAGPUR_RE_TIMESERIES", "./store/locality_timeseries.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS locality_prices (
+    locality TEXT,
+    scrape_date TEXT,
+    avg_price_per_sqft REAL,
+    median_price REAL,
+    total_listings INTEGER,
+    PRIMARY KEY (locality, scrape_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS locality_prices_date ON locality_prices (scrape_date);
+"""
+
+VALUE_COLUMNS = ["avg_price_per_sqft", "median_price", "total_listings"]
+
+# Resampling frequencies ``series`` accepts
+FREQUENCIES = {"D": "D", "W": "W-SUN"}
+
+
+class TimeSeriesStore:
+    """Per-locality price aggregates, one row per (locality, scrape_date).
+
+    Each pipeline run appends its locality summary; rerunning a day replaces
+    that day's rows. The primary key doubles as the index for range queries
+    on one locality's history.
+    """
+
+    def __init__(self, path=TIMESERIES_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Shared by Streamlit's script threads when held in st.cache_resource;
+        # sqlite3 connections are not safe for concurrent use, so every call holds the lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.executescript(SCHEMA)
+
+    def append(self, summary, scrape_date=None):
+        """Upserts a locality summary (the ``cleaned`` stage frame). Returns the row count."""
+        if "scrape_date" not in summary.columns:
+            summary = summary.assign(scrape_date=scrape_date or datetime.today().date())
+        rows = [
+            (locality, str(pd.Timestamp(date).date()),
+             *(None if pd.isna(value) else float(value) for value in values))
+            for locality, date, *values in summary.reindex(
+                columns=["locality", "scrape_date"] + VALUE_COLUMNS).itertuples(index=False)
+        ]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO locality_prices VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def _column(self, query):
+        with self._lock:
+            return [row[0] for row in self.conn.execute(query).fetchall()]
+
+    def localities(self):
+        return self._column("SELECT DISTINCT locality FROM locality_prices ORDER BY locality")
+
+    def dates(self):
+        return self._column("SELECT DISTINCT scrape_date FROM locality_prices ORDER BY scrape_date")
+
+    def history(self, localities=None, start=None, end=None):
+        """Rows in ``[start, end]`` for the given localities (all by default), sorted by locality and date."""
+        clauses, params = [], []
+        if localities is not None:
+            localities = [localities] if isinstance(localities, str) else list(localities)
+            clauses.append(f"locality IN ({','.join('?' * len(localities))})")
+            params += localities
+        if start is not None:
+            clauses.append("scrape_date >= ?")
+            params.append(str(pd.Timestamp(start).date()))
+        if end is not None:
+            clauses.append("scrape_date <= ?")
+            params.append(str(pd.Timestamp(end).date()))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            df = pd.read_sql_query(
+                f"SELECT * FROM locality_prices{where} ORDER BY locality, scrape_date", self.conn, params=params)
+        df["scrape_date"] = pd.to_datetime(df["scrape_date"])
+        return df
+
+    def series(self, locality, start=None, end=None, freq="D", value="avg_price_per_sqft"):
+        """One locality's ``ds``/``y`` frame, ready for the forecasters.
+
+        Observations are averaged per day (``freq="D"``) or per week ending
+        Sunday (``"W"``); periods without a scrape are left out rather than
+        filled, which Prophet handles.
+        """
+        history = self.history(locality, start, end)
+        y = history.set_index("scrape_date")[value].resample(FREQUENCIES[freq]).mean().dropna()
+        return pd.DataFrame({"ds": y.index, "y": y.to_numpy()})
+
+    def backfill(self, root=None):
+        """Loads every ``scrape_date`` of the ``cleaned`` stage already in the Parquet store."""
+        from storage import STORE_ROOT, read_stage
+        summary = read_stage("cleaned", columns=["locality", "scrape_date"] + VALUE_COLUMNS, root=root or STORE_ROOT)
+        return self.append(summary)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-locality price history built from each run's summary.")
+    parser.add_argument("command", choices=["backfill", "dates", "show"])
+    parser.add_argument("--locality")
+    parser.add_argument("--freq", default="D", choices=sorted(FREQUENCIES))
+    args = parser.parse_args()
+
+    store = TimeSeriesStore()
+    if args.command == "backfill":
+        print(f"Loaded {store.backfill()} locality-days into {store.path}")
+    elif args.command == "dates":
+        print("\n".join(store.dates()))
+    else:
+        print(store.series(args.locality, freq=args.freq).to_string(index=False))
+    store.close()
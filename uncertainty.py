@@ -0,0 +1,145 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# "prophet": Prophet's own interval, from UNCERTAINTY_SAMPLES simulated paths per prediction
+# "bootstrap": Prophet fitted without sampling; the interval comes from a
+#              residual bootstrap run over many localities at once
+UNCERTAINTY_ENGINE = os.environ.get("NAGPUR_RE_UNCERTAINTY", "prophet")
+UNCERTAINTY_SAMPLES = int(os.environ.get("NAGPUR_RE_UNCERTAINTY_SAMPLES", "1000"))
+# Lower and upper quantile of the band; Prophet's default 80% interval
+INTERVAL_QUANTILES = (0.1, 0.9)
+
+# Resampled values held in memory at once by bootstrap_intervals
+BATCH_ELEMENTS = 4_000_000
+# Dates per trajectory the band is evaluated at; it is linear interpolation in between
+BAND_KNOTS = 32
+
+
+class UncertaintyConfig:
+    """How forecast intervals are computed: ``engine``, ``samples`` and the band's ``quantiles``."""
+
+    def __init__(self, engine=UNCERTAINTY_ENGINE, samples=UNCERTAINTY_SAMPLES, quantiles=INTERVAL_QUANTILES):
+        if engine not in ("prophet", "bootstrap"):
+            raise ValueError(f"Unknown uncertainty engine {engine!r}")
+        if int(samples) < 1:
+            # Zero samples would leave Prophet's trajectories without a band and break the bootstrap
+            raise ValueError(f"Uncertainty samples must be at least 1, got {samples}")
+        lower, upper = quantiles
+        if not 0 <= lower < upper <= 1:
+            raise ValueError(f"Interval quantiles must satisfy 0 <= lower < upper <= 1, got {quantiles}")
+        self.engine = engine
+        self.samples = int(samples)
+        self.quantiles = (float(lower), float(upper))
+
+    @property
+    def prophet_samples(self):
+        """``uncertainty_samples`` to give Prophet: none when the bootstrap draws the band."""
+        return self.samples if self.engine == "prophet" else 0
+
+    @property
+    def interval_width(self):
+        # Prophet's band is central, so only the distance between the quantiles carries over
+        lower, upper = self.quantiles
+        return upper - lower
+
+    @property
+    def variant(self):
+        """Forecast cache variant; None for Prophet's default interval, so existing entries stay valid."""
+        if self.engine == "prophet" and self.samples == 1000 and self.quantiles == (0.1, 0.9):
+            return None
+        lower, upper = self.quantiles
+        return f"{self.engine}-{self.samples}-{lower:g}-{upper:g}"
+
+
+def _days(ds):
+    return pd.to_datetime(ds).to_numpy(dtype="datetime64[ns]").astype(np.int64) / 86_400e9
+
+
+def _resample_positions(rng, n, shape):
+    # Uniform picks below the locality's length n; floats are much faster to draw than bounded ints
+    return np.minimum((rng.random(shape, dtype=np.float32) * n).astype(np.intp), n - 1)
+
+
+def bootstrap_intervals(histories, trajectories, samples=UNCERTAINTY_SAMPLES, quantiles=INTERVAL_QUANTILES,
+                        seeds=None, batch_elements=BATCH_ELEMENTS):
+    """Adds ``yhat_lower``/``yhat_upper`` to forecast trajectories by residual bootstrap.
+
+    ``histories`` are the ``ds``/``y`` frames the trajectories were fitted
+    on; ``trajectories`` are ``ds``/``yhat`` frames covering the history and
+    the horizon, as Prophet predicts them. For each locality the in-sample
+    residuals are centred and resampled ``samples`` times. Each resample is
+    regressed on time, giving the error in the fitted level and slope, and
+    one more resampled residual adds the observation noise, so the band
+    widens with distance from the history. Quantiles are taken per date, so
+    each sample's noise draw can be shared across dates; the band is then
+    smooth in time and is evaluated at BAND_KNOTS dates and interpolated.
+    Localities are processed in batches of padded arrays, about
+    ``batch_elements`` values at a time. ``seeds`` holds one seed per
+    locality (0 for all when omitted), and each locality draws from its own
+    generator, so its band does not depend on the other localities in the
+    call. Returns new frames in the same order.
+    """
+    if samples < 1:
+        raise ValueError(f"Bootstrap samples must be at least 1, got {samples}")
+    seeds = [0] * len(trajectories) if seeds is None else list(seeds)
+    lower, upper = quantiles
+
+    residuals, offsets, targets = [], [], []
+    for ts_data, trajectory in zip(histories, trajectories):
+        t, dates = _days(ts_data["ds"]), _days(trajectory["ds"])
+        # Prophet's trajectory covers every history date, in order
+        pos = np.minimum(np.searchsorted(dates, t), len(dates) - 1)
+        matched = dates[pos] == t
+        r = ts_data["y"].to_numpy(dtype=float)[matched] - trajectory["yhat"].to_numpy()[pos[matched]]
+        t = t[matched]
+        if len(r) == 0:
+            r, t = np.zeros(1), dates[:1]
+        residuals.append(r - r.mean())
+        offsets.append(t - t.mean())
+        targets.append(dates - t.mean())
+
+    results = []
+    width = max(len(r) for r in residuals) if residuals else 1
+    batch = max(1, batch_elements // (samples * max(width, BAND_KNOTS)))
+    for start in range(0, len(residuals), batch):
+        r_batch, o_batch, t_batch, s_batch = (part[start:start + batch]
+                                              for part in (residuals, offsets, targets, seeds))
+        n = np.array([len(r) for r in r_batch])
+        width = n.max()
+
+        # Padded (localities, positions) arrays; padding gets zero weight in the regression
+        r_pad = np.zeros((len(n), width))
+        weights = np.zeros((len(n), width, 2))
+        knots = np.empty((len(n), BAND_KNOTS))
+        # (localities, samples, positions) resamples of each locality's own residuals, and
+        # one more per sample for the noise, drawn from the locality's own seed
+        picks = np.zeros((len(n), samples, width), dtype=np.intp)
+        noise_picks = np.empty((len(n), samples), dtype=np.intp)
+        for i, (r, offset, target, seed) in enumerate(zip(r_batch, o_batch, t_batch, s_batch)):
+            r_pad[i, :len(r)] = r
+            spread = (offset ** 2).sum()
+            weights[i, :len(r), 0] = 1 / len(r)
+            weights[i, :len(r), 1] = offset / spread if spread > 0 else 0.0
+            knots[i] = np.linspace(target.min(), target.max(), BAND_KNOTS)
+            rng = np.random.default_rng(seed)
+            picks[i, :, :len(r)] = _resample_positions(rng, len(r), (samples, len(r)))
+            noise_picks[i] = _resample_positions(rng, len(r), samples)
+
+        resampled = np.take_along_axis(r_pad[:, None, :], picks, axis=2)
+        # Least-squares level and slope of every resample at once
+        fit = resampled @ weights
+        level, slope = fit[..., 0], fit[..., 1]
+        noise = np.take_along_axis(r_pad, noise_picks, axis=1)
+
+        # (localities, knots, samples), so the quantiles reduce the contiguous axis
+        errors = (level + noise)[:, None, :] + slope[:, None, :] * knots[:, :, None]
+        bands = np.quantile(errors, [lower, upper], axis=2)
+
+        for i, (trajectory, target) in enumerate(zip(trajectories[start:start + len(n)], t_batch)):
+            yhat = trajectory["yhat"].to_numpy()
+            results.append(trajectory.assign(yhat_lower=yhat + np.interp(target, knots[i], bands[0, i]),
+                                             yhat_upper=yhat + np.interp(target, knots[i], bands[1, i])))
+    return results